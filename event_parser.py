@@ -4,37 +4,83 @@ This module contains classes for extracting timestamps and other data from log l
 """
 import re
 
+# Patterns are compiled once at import time; the extract_* methods run on
+# every log line, so this avoids the re module cache lookup per call.
+_MARKER1 = re.compile(r'EPDC\]\[(\d+)\]')
+_MARKER2 = re.compile(r'mxc_epdc_fb: \[(\d+)\]')
+_HEIGHT = re.compile(r'height=(\d+)')
+_WIDTH_HEIGHT = re.compile(r'width=\d+, height=(\d+)')
+# Tried in order, so a line with several waveform forms reports the one from
+# the earliest pattern. Spacing around '=', after "update." and before the
+# name is matched loosely.
+_WAVEFORM_PATTERNS = tuple(re.compile(p) for p in (
+    r'new waveform\s*=\s*(?:0x)?[\da-f]+\s*\(([\w_() ]+)\)',
+    r'waveform:(?:0x)?[\da-f]+\s*\(([\w_() ]+)\)',
+    r'waveform=(?:0x)?[\da-f]+\s*\(([\w_() ]+)\)',
+    r'Sending update\.\s*waveform:(?:0x)?[\da-f]+\s*\(([\w_() ]+)\)'
+))
+_END_TIME = re.compile(r'end time=(\d+)')
+# Start timestamps capture the seconds and at most the first 3 fraction
+# digits as separate groups, which is all EventParser._decode_timestamp uses
+_BTN_UP = re.compile(r'button 1 up (\d+)\.(\d{1,3})\d*')
+_BTN_DOWN = re.compile(r'Sending button 1 down (\d+)\.(\d{1,3})\d*')
+_SUSPEND_PATTERNS = (
+    # Standard pattern from specifications
+    r'def:pbpress:time=(\d+):Power button pressed',
+
+    # Alternative patterns that might appear in logs
+    r'Power button pressed.*time[=:](\d+)',
+    r'pbpress.*time[=:](\d+)',
+    r'button.*power.*time[=:](\d+)',
+    r'Power.*button.*time[=:](\d+)',
+    r'Power.*pressed.*time[=:](\d+)',
+
+    # General timestamp extraction if line contains power button reference
+    r'(?:power|pb).*(\d{6,})'
+)
+# All suspend patterns in one regex, applied with match() at the start of the
+# line. Each alternative is a lookahead that searches the rest of the line, so
+# the patterns keep their priority order exactly as if they were tried one
+# after another, and the capturing group that took part tells which matched.
+_SUSPEND_START = re.compile(
+    '|'.join(r'(?=(?s:.*?)' + p + ')' for p in _SUSPEND_PATTERNS),
+    re.IGNORECASE
+)
+
 class BaseEventParser:
     """Base class for parsing log events with common extraction methods"""
     
+    # Literal every start line contains, so callers can skip lines without it
+    # before calling extract_start_timestamp. Empty means no such literal.
+    start_token = ''
+    
     def extract_marker(self, line):
-        """Extract marker number from log line"""
-        match1 = re.search(r'EPDC\]\[(\d+)\]', line)
-        if match1:
-            return match1.group(1)
+        """Extract marker number from log line as an int"""
+        # Each regex only runs when its literal prefix is on the line
+        if 'EPDC][' in line:
+            match1 = _MARKER1.search(line)
+            if match1:
+                return int(match1.group(1))
         
-        match2 = re.search(r'mxc_epdc_fb: \[(\d+)\]', line)
-        if match2:
-            return match2.group(1)
+        if 'mxc_epdc_fb: [' in line:
+            match2 = _MARKER2.search(line)
+            if match2:
+                return int(match2.group(1))
         
         return None
 
     def extract_height_and_waveform(self, line):
         """Extract height and waveform information from log line"""
-        height_match = re.search(r'height=(\d+)', line)
-        if not height_match:
-            height_match = re.search(r'width=\d+, height=(\d+)', line)
+        if 'height=' not in line:
+            return None
         
-        waveform_patterns = [
-            r'new waveform = (?:0x)?[\da-f]+ \(([\w_() ]+)\)', 
-            r'waveform:(?:0x)?[\da-f]+ \(([\w_() ]+)\)',
-            r'waveform=(?:0x)?[\da-f]+ \(([\w_() ]+)\)',
-            r'Sending update\. waveform:(?:0x)?[\da-f]+ \(([\w_() ]+)\)'
-        ]
+        height_match = _HEIGHT.search(line)
+        if not height_match:
+            height_match = _WIDTH_HEIGHT.search(line)
         
         waveform_name = None
-        for pattern in waveform_patterns:
-            match = re.search(pattern, line)
+        for pattern in _WAVEFORM_PATTERNS:
+            match = pattern.search(line)
             if match:
                 waveform_name = match.group(1).strip()
                 break
@@ -49,112 +95,142 @@ class BaseEventParser:
 
     def extract_end_timestamp(self, line):
         """Extract end timestamp from log line"""
-        match = re.search(r'end time=(\d+)', line)
+        if 'end time=' not in line:
+            return None
+        
+        match = _END_TIME.search(line)
         if match:
-            timestamp_str = match.group(1)
-            last_6 = timestamp_str[-6:]
-            return int(last_6)
+            # Only the last 6 digits are kept
+            return int(match.group(1)) % 1000000
         return None
     
     def extract_start_timestamp(self, line):
         """Base method for extracting start timestamp - to be implemented by subclasses"""
         return None
-
-class DefaultEventParser(BaseEventParser):
-    """Parser for default mode (Button Up)"""
     
-    def extract_start_timestamp(self, line):
-        """Extract start timestamp from "button 1 up" event"""
-        match = re.search(r'button 1 up (\d+\.\d+)', line)
-        if match:
-            timestamp_str = match.group(1)
-            parts = timestamp_str.split('.')
-            if len(parts) == 2:
-                last_3_first = parts[0][-3:]
-                first_3_second = parts[1][:3]
-                result = int(last_3_first + first_3_second)
-                return result
-        return None
+    def find_start(self, text):
+        """Find the first line of text with a non-zero start timestamp
+        
+        Returns (timestamp, line) with the line unstripped, or (None, None).
+        """
+        for line in text.split('\n'):
+            if self.start_token in line:
+                timestamp = self.extract_start_timestamp(line)
+                if timestamp:
+                    return timestamp, line
+        return None, None
 
-class SwipeEventParser(BaseEventParser):
-    """Parser for swipe mode (Button Down)"""
+class EventParser(BaseEventParser):
+    """Parser for modes whose start event carries a seconds.fraction timestamp
+    
+    start_token is a literal every start line contains and start_re captures
+    the timestamp from it, so one class serves the button up, button down and
+    power button press events.
+    """
+    
+    def __init__(self, start_token, start_re):
+        self.start_token = start_token
+        self._start_re = start_re
     
     def extract_start_timestamp(self, line):
-        """Extract start timestamp from "Sending button 1 down" event"""
-        match = re.search(r'Sending button 1 down (\d+\.\d+)', line)
-        if match:
-            timestamp_str = match.group(1)
-            parts = timestamp_str.split('.')
-            if len(parts) == 2:
-                last_3_first = parts[0][-3:]
-                first_3_second = parts[1][:3]
-                result = int(last_3_first + first_3_second)
-                return result
-        return None
+        """Extract start timestamp from the mode's start event"""
+        if self.start_token not in line:
+            return None
+        
+        match = self._start_re.search(line)
+        return self._decode_timestamp(match) if match else None
+    
+    def find_start(self, text):
+        """Find the first line of text with a non-zero start timestamp
+        
+        start_re is searched over the whole text instead of line by line.
+        Like extract_start_timestamp, only the first match on a line
+        counts, so a zero timestamp moves the search on to the next line.
+        """
+        search = self._start_re.search
+        match = search(text)
+        while match:
+            line_end = text.find('\n', match.end())
+            if line_end == -1:
+                line_end = len(text)
+            timestamp = self._decode_timestamp(match)
+            if timestamp:
+                line_start = text.rfind('\n', 0, match.start()) + 1
+                return timestamp, text[line_start:line_end]
+            match = search(text, line_end)
+        return None, None
+    
+    @staticmethod
+    def _decode_timestamp(match):
+        """Last 3 digits before the dot followed by the first 3 after it
+        
+        start_re captures the seconds and the (up to 3) fraction digits as
+        groups 1 and 2.
+        """
+        seconds, fraction = match.groups()
+        return int(seconds[-3:]) * 10 ** len(fraction) + int(fraction)
 
 class SuspendEventParser(BaseEventParser):
     """Enhanced parser for suspend mode (Power Button) with multiple patterns"""
     
     def extract_start_timestamp(self, line):
         """Extract start timestamp from power button press event with multiple pattern matching"""
-        # Try multiple patterns for power button presses
-        patterns = [
-            # Standard pattern from specifications
-            r'def:pbpress:time=(\d+):Power button pressed',
-            
-            # Alternative patterns that might appear in logs
-            r'Power button pressed.*time[=:](\d+)',
-            r'pbpress.*time[=:](\d+)',
-            r'button.*power.*time[=:](\d+)',
-            r'Power.*button.*time[=:](\d+)',
-            r'Power.*pressed.*time[=:](\d+)',
-            
-            # General timestamp extraction if line contains power button reference
-            r'(?:power|pb).*(\d{6,})'
-        ]
+        # Every pattern needs "power" or "pb" somewhere in the line, so a
+        # lowercase substring check rejects most lines without any regex
+        lowered = line.lower()
+        if 'power' not in lowered and 'pb' not in lowered:
+            return None
         
-        for pattern in patterns:
-            match = re.search(pattern, line, re.IGNORECASE)
-            if match:
-                timestamp_str = match.group(1)
-                
-                # Handle different timestamp formats
-                if len(timestamp_str) > 6:
-                    # If timestamp is longer, take last 6 digits
-                    last_6 = timestamp_str[-6:]
-                    return int(last_6)
-                elif len(timestamp_str) == 6:
-                    # If already 6 digits, use as is
-                    return int(timestamp_str)
-                else:
-                    # Pad shorter timestamps
-                    return int(timestamp_str.zfill(6))
+        # Try multiple patterns for power button presses
+        match = _SUSPEND_START.match(line)
+        if match:
+            # Longer timestamps keep their last 6 digits; shorter ones are
+            # already below that and need no padding to compare
+            return int(match.group(match.lastindex)) % 1000000
         
         # Debug output for power button related lines to help identify format
-        if 'power button' in line.lower() or 'pbpress' in line.lower():
+        if 'power button' in lowered or 'pbpress' in lowered:
             print(f"Debug - Found power button line but couldn't extract timestamp: {line.strip()}")
             
         return None
 
+_PARSERS = {
+    "default": lambda: EventParser('button 1 up ', _BTN_UP),  # Button Up
+    "swipe": lambda: EventParser('Sending button 1 down ', _BTN_DOWN),  # Button Down
+    "suspend": SuspendEventParser
+}
+# Parsers hold no state, so one shared instance per mode is handed out
+_PARSER_CACHE = {}
+
 def get_parser(mode="default"):
     """Factory function to get the appropriate parser for the specified mode"""
-    parsers = {
-        "default": DefaultEventParser,
-        "swipe": SwipeEventParser,
-        "suspend": SuspendEventParser
-    }
-    return parsers.get(mode, DefaultEventParser)()
+    parser = _PARSER_CACHE.get(mode)
+    if parser is None:
+        parser = _PARSER_CACHE[mode] = _PARSERS.get(mode, _PARSERS["default"])()
+    return parser
 
 def debug_timestamp_extraction(log_content):
     """Debug function to show timestamp extraction from different parsers"""
+    _debug_timestamp_lines(log_content.split('\n'))
+
+def debug_timestamp_extraction_file(path, buffer_size=1 << 20):
+    """Debug timestamp extraction for a log file without loading it whole
+
+    The file is read through a buffer of buffer_size bytes and scanned line
+    by line, so memory stays bounded for multi-megabyte logs.
+    """
+    with open(path, 'r', encoding='utf-8', errors='ignore', buffering=buffer_size) as f:
+        _debug_timestamp_lines(f)
+
+def _debug_timestamp_lines(lines):
+    """Print the start timestamps each parser extracts from an iterable of lines"""
     print("\n==== TIMESTAMP EXTRACTION DEBUGGING ====")
     
-    default_parser = DefaultEventParser()
-    swipe_parser = SwipeEventParser()
-    suspend_parser = SuspendEventParser()
+    default_parser = get_parser("default")
+    swipe_parser = get_parser("swipe")
+    suspend_parser = get_parser("suspend")
     
     # Process lines looking for timestamps
-    lines = log_content.split('\n')
     for i, line in enumerate(lines):
         default_ts = default_parser.extract_start_timestamp(line)
         swipe_ts = swipe_parser.extract_start_timestamp(line)
@@ -5,100 +5,376 @@ Final Kindle Log Analyzer with PDF Export, Enhanced TXT, and Waveform Boxes
 import sys
 import os
 import re
+import html
+import mmap
+import multiprocessing
+from collections import deque, namedtuple
+from contextlib import nullcontext
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime
+from itertools import islice, repeat
 from pathlib import Path
-# Import the new export and visualization modules
-try:
-    from pdf_export import PdfExporter
-    from txt_export import TxtExporter
-    from waveform_plot import WaveformVisualizer
-    ENHANCED_EXPORTS_AVAILABLE = True
-except ImportError as e:
-    print(f"Warning: Enhanced export modules not available: {e}")
-    ENHANCED_EXPORTS_AVAILABLE = False
-
 from PyQt5.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, 
     QHBoxLayout, QTextEdit, QPushButton, QLabel, 
-    QTableWidget, QTableWidgetItem, QTabWidget,
+    QTableView, QTabWidget,
     QSplitter, QGroupBox, QFileDialog, QProgressBar, 
     QLineEdit, QComboBox, QListWidget, QMessageBox,
-    QHeaderView, QAbstractItemView, QCheckBox, QGridLayout,
-    QFrame, QScrollArea)
-from PyQt5.QtCore import Qt, QThread, pyqtSignal, QTimer
-from PyQt5.QtGui import QFont, QColor, QBrush, QPalette, QPixmap
+    QHeaderView, QAbstractItemView, QCheckBox, QListView,
+    QStyledItemDelegate, QStyle, QStyleOptionButton)
+from PyQt5.QtCore import (Qt, QThread, pyqtSignal, QTimer, QAbstractTableModel, QModelIndex,
+    QEvent, QRect, QSize)
+from PyQt5.QtGui import QFont, QColor, QBrush, QPalette, QPixmap, QPainter, QPen
 import openpyxl
+from openpyxl.cell import WriteOnlyCell
 from openpyxl.styles import Font, Alignment, PatternFill
-
-class FixedSuspendEventParser:
-    """Fixed parser for suspend mode (Power Button) based on user's sample"""
+from openpyxl.utils import get_column_letter
+
+from event_parser import EventParser, get_parser
+
+# Precompiled patterns used by the suspend parser and process_iteration,
+# which run them against every candidate log line
+_END_MARKER = re.compile(r'update end marker=(\d+)')
+_PB_START = re.compile(r'def:pbpress:time=(\d+)\.(\d{1,3})\d*:Power button pressed')
+# Iteration headers in pasted text and in mapped log files
+_ITERATION_HEADER = re.compile(r'ITERATION_(\d+)')
+_ITERATION_HEADER_BYTES = re.compile(rb'ITERATION_(\d+)')
+
+# Fixed parser for suspend mode (Power Button) based on user's sample:
+# def:pbpress:time=XXXX.XXX:Power button pressed
+_SUSPEND_PARSER = EventParser('def:pbpress:time=', _PB_START)
+
+# Any literal that makes a line relevant to process_iteration's marker,
+# height and end time loop
+_CANDIDATE_LINE = re.compile('|'.join(
+    re.escape(token)
+    for token in ('EPDC]', 'mxc_epdc_fb', 'Sending update', 'update end marker=')
+))
+
+def iter_candidate_lines(content, pattern):
+    """Yield only the lines of content that contain a match for pattern
+
+    The pattern is run over the whole text, so lines without any match are
+    skipped by the regex engine instead of being split out and tested one
+    at a time.
+    """
+    search = pattern.search
+    pos = 0
+    while True:
+        match = search(content, pos)
+        if not match:
+            return
+        line_start = content.rfind('\n', 0, match.start()) + 1
+        line_end = content.find('\n', match.end())
+        if line_end == -1:
+            line_end = len(content)
+        yield content[line_start:line_end]
+        pos = line_end + 1
+
+def iter_iterations(log_content):
+    """Yield (iteration_num, iteration_content) for each ITERATION_<n> block
+
+    Pairs match what re.split on the header produced: text before the first
+    header is dropped, and content without any header is iteration 1. The
+    iteration number is converted to int here, once per block.
+    Each block is sliced only when it is reached, so the whole log is never
+    held as a second list of strings.
+    """
+    previous = None
+    for match in _ITERATION_HEADER.finditer(log_content):
+        if previous is not None:
+            yield int(previous.group(1)), log_content[previous.end():match.start()]
+        previous = match
     
-    def extract_marker(self, line):
-        """Extract marker number from log line"""
-        match1 = re.search(r'EPDC\]\[(\d+)\]', line)
-        if match1:
-            return match1.group(1)
-        
-        match2 = re.search(r'mxc_epdc_fb: \[(\d+)\]', line)
-        if match2:
-            return match2.group(1)
+    if previous is None:
+        yield 1, log_content
+    else:
+        yield int(previous.group(1)), log_content[previous.end():]
+
+def _decode_log_bytes(data):
+    """Decode raw log bytes the way open(..., 'r', errors='ignore') reads them"""
+    return data.decode('utf-8', errors='ignore').replace('\r\n', '\n').replace('\r', '\n')
+
+def iter_file_iterations(path):
+    """Yield (iteration_num, iteration_content) for each ITERATION_<n> block of a log file
+
+    Same pairing as iter_iterations, but the headers are found in a
+    read-only mmap of the file and each block is decoded only when it is
+    reached, so the whole log is never read into one string.
+    """
+    with open(path, 'rb') as f:
+        # mmap cannot map an empty file
+        if os.fstat(f.fileno()).st_size == 0:
+            yield 1, ""
+            return
         
-        return None
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            previous = None
+            for match in _ITERATION_HEADER_BYTES.finditer(mm):
+                if previous is not None:
+                    yield (int(previous.group(1)),
+                           _decode_log_bytes(mm[previous.end():match.start()]))
+                previous = match
+            
+            if previous is None:
+                yield 1, _decode_log_bytes(mm[:])
+            else:
+                yield int(previous.group(1)), _decode_log_bytes(mm[previous.end():])
 
-    def extract_height_and_waveform(self, line):
-        """Extract height and waveform information from log line"""
-        height_match = re.search(r'height=(\d+)', line)
-        if not height_match:
-            height_match = re.search(r'width=\d+, height=(\d+)', line)
-        
-        waveform_patterns = [
-            r'new waveform = (?:0x)?[\da-f]+ \(([\w_() ]+)\)', 
-            r'waveform:(?:0x)?[\da-f]+ \(([\w_() ]+)\)',
-            r'waveform=(?:0x)?[\da-f]+ \(([\w_() ]+)\)',
-            r'Sending update\. waveform:(?:0x)?[\da-f]+ \(([\w_() ]+)\)'
-        ]
-        
-        waveform_name = None
-        for pattern in waveform_patterns:
-            match = re.search(pattern, line)
-            if match:
-                waveform_name = match.group(1).strip()
-                break
-        
-        if height_match:
-            height = int(height_match.group(1))
-            return {
-                'height': height,
-                'waveform': waveform_name if waveform_name else "unknown"
-            }
-        return None
+# Write buffer for the enhanced TXT report
+REPORT_BUFFER_SIZE = 1 << 20
+
+# How many batch files are read ahead of the one being processed
+BATCH_READ_AHEAD = 4
+
+def _read_file_iterations(path):
+    """Read a log file into its list of (iteration_num, iteration_content) pairs"""
+    return list(iter_file_iterations(path))
+
+def iter_read_files(paths, read_ahead=BATCH_READ_AHEAD):
+    """Yield (path, future) for each path in order, reading the files on worker threads
+
+    Up to read_ahead files are read while an earlier one is consumed, so
+    disk reads overlap with processing. future.result() returns the file's
+    iteration pairs or raises the error reading it.
+    """
+    paths = list(paths)
+    if not paths:
+        return
+    
+    with ThreadPoolExecutor(max_workers=min(read_ahead, len(paths))) as executor:
+        pending = deque()
+        for path in paths:
+            pending.append((path, executor.submit(_read_file_iterations, path)))
+            if len(pending) > read_ahead:
+                yield pending.popleft()
+        while pending:
+            yield pending.popleft()
+
+# One row of a result's all_heights listing, shared with the exporters
+HeightRow = namedtuple('HeightRow', 'marker height waveform')
+
+class _HeightRecord:
+    """Last 'Sending update' height seen for a marker within an iteration"""
+    
+    # A marker gets one record per update line, so skip the per-instance dict
+    __slots__ = ('height', 'waveform')
+    
+    def __init__(self, height, waveform):
+        self.height = height
+        self.waveform = waveform
 
-    def extract_end_timestamp(self, line):
-        """Extract end timestamp from log line"""
-        match = re.search(r'end time=(\d+)', line)
-        if match:
-            timestamp_str = match.group(1)
-            last_6 = timestamp_str[-6:]
-            return int(last_6)
+def process_iteration(iteration_content, iteration_num, mode="default"):
+    """Process a single iteration's log text with fixed suspend parsing
+
+    Kept at module level so ProcessPoolExecutor workers can pickle it.
+    """
+    
+    # Get appropriate parser
+    if mode == "suspend":
+        parser = _SUSPEND_PARSER
+    else:
+        # Use original parsers for default and swipe
+        parser = get_parser("default" if mode == "default" else "swipe")
+    
+    # The start event is found with one search over the whole iteration, so
+    # the per-line loop below only handles markers, heights and end times
+    start_time, start_line = parser.find_start(iteration_content)
+    if not start_time:
         return None
+    start_line = start_line.strip()  # Store the start line for highlighting
     
-    def extract_start_timestamp(self, line):
-        """Extract start timestamp from power button press - FIXED VERSION"""
-        # Look for the specific pattern: def:pbpress:time=XXXX.XXX:Power button pressed
-        match = re.search(r'def:pbpress:time=(\d+\.\d+):Power button pressed', line)
-        if match:
-            timestamp_str = match.group(1)
-            parts = timestamp_str.split('.')
-            if len(parts) == 2:
-                # Take last 3-6 digits before dot, then first 3 digits after dot
-                before_dot = parts[0]
-                after_dot = parts[1][:3]  # First 3 digits after dot
-                
-                # Take last 3 digits before dot to match the format
-                last_digits_before = before_dot[-3:]
-                result = int(last_digits_before + after_dot)
-                return result
+    end_times_by_marker = {}
+    latest_end_time = 0  # Maximum over end_times_by_marker, kept as it fills
+    heights_by_marker = {}
+    current_marker = None
+    
+    # Bind the per-line callables to locals so the loop body does not
+    # repeat the attribute lookups for every line
+    extract_marker = parser.extract_marker
+    extract_height_and_waveform = parser.extract_height_and_waveform
+    extract_end_timestamp = parser.extract_end_timestamp
+    search_end_marker = _END_MARKER.search
+    
+    # Only lines holding a marker, update or end event can affect the
+    # result, so the rest of the iteration is never visited. Cheap
+    # substring checks gate each regex below so most lines never reach
+    # the regex engine.
+    for line in iter_candidate_lines(iteration_content, _CANDIDATE_LINE):
+        if 'EPDC]' in line or 'mxc_epdc_fb' in line:
+            marker = extract_marker(line)
+            if marker is not None:
+                current_marker = marker
         
+        if "Sending update" in line and current_marker is not None and 'height=' in line:
+            height_waveform = extract_height_and_waveform(line)
+            if height_waveform:
+                height = height_waveform['height']
+                waveform = height_waveform['waveform']
+                
+                heights_by_marker[current_marker] = _HeightRecord(
+                    height,
+                    waveform if waveform and waveform != "auto" else "unknown"
+                )
+        
+        if "update end marker=" in line and "end time=" in line:
+            end_marker_match = search_end_marker(line)
+            if end_marker_match:
+                end_marker = int(end_marker_match.group(1))
+                end_time = extract_end_timestamp(line)
+                if end_time:
+                    previous = end_times_by_marker.get(end_marker)
+                    end_times_by_marker[end_marker] = {'time': end_time}
+                    if end_time >= latest_end_time:
+                        latest_end_time = end_time
+                    elif previous is not None and previous['time'] == latest_end_time:
+                        # The marker holding the maximum was overwritten with
+                        # an earlier time, so look the maximum up again
+                        latest_end_time = max(info['time'] for info in end_times_by_marker.values())
+    
+    if not heights_by_marker or not end_times_by_marker:
         return None
+    
+    # Find the highest marker among those with a known waveform in one
+    # pass, keeping the highest over all markers as a fallback for when
+    # every waveform is "unknown". Ties on height go to the
+    # highest-numbered marker. Markers are ints, so they compare natively.
+    # The same pass builds the all_heights listing for the result.
+    valid_key = valid_marker = None  # key is (height, marker)
+    any_key = any_marker = None
+    all_heights = []
+    for marker, info in heights_by_marker.items():
+        height = info.height
+        all_heights.append(HeightRow(marker, height, info.waveform))
+        key = (height, marker)
+        if any_key is None or key >= any_key:
+            any_key, any_marker = key, marker
+        if info.waveform.lower() != "unknown":
+            if valid_key is None or key >= valid_key:
+                valid_key, valid_marker = key, marker
+    
+    chosen_marker = valid_marker if valid_key is not None else any_marker
+    
+    max_height_info = heights_by_marker[chosen_marker]
+    
+    # Get the end time for the chosen marker with a single lookup
+    chosen_end = end_times_by_marker.get(chosen_marker)
+    if chosen_end is not None:
+        max_height_end_time = chosen_end['time']
+    else:
+        # If no end time for the chosen marker, use the maximum end time.
+        # end_times_by_marker is known to be non-empty by now.
+        max_height_end_time = latest_end_time
+    
+    # Calculate duration
+    duration = max_height_end_time - start_time
+    if duration < 0:
+        duration = abs(duration)
+
+    # Convert duration from milliseconds to seconds
+    duration = duration / 1000.0
+
+    return {
+        'iteration': int(iteration_num),  # Already an int when from iter_iterations
+        'start': start_time,
+        'stop': max_height_end_time,
+        'marker': chosen_marker,
+        'duration': duration,
+        'max_height': max_height_info.height,
+        'max_height_waveform': max_height_info.waveform,
+        'start_line': start_line,  # For PDF highlighting
+        'all_heights': all_heights,
+        'mode': mode,
+        'all_end_times': end_times_by_marker
+    }
+
+# Below this many iterations process_iterations does not start a process pool.
+# A spawned worker takes about 0.35s to start (it imports PyQt5 and openpyxl)
+# while an iteration is parsed in well under a millisecond, so only long
+# logs win anything from the pool.
+POOL_MIN_ITERATIONS = 1024
+# Each worker is handed about this many chunks, which evens out iterations
+# of different lengths without paying the per-task overhead for every one
+POOL_CHUNKS_PER_WORKER = 4
+# Pools are started from QThreads, and forking a multithreaded Qt process
+# can deadlock the child, so workers are spawned instead
+_POOL_CONTEXT = multiprocessing.get_context('spawn')
+
+def _process_pool(jobs):
+    """Start a ProcessPoolExecutor with no more workers than jobs"""
+    return ProcessPoolExecutor(max_workers=min(os.cpu_count() or 1, jobs),
+                               mp_context=_POOL_CONTEXT)
+
+def process_iterations(iterations, mode="default", executor=None):
+    """Yield (iteration_num, iteration_content, result) for (num, content) pairs in order
+
+    Iterations are independent, so runs with enough of them are spread
+    over a process pool. Smaller runs are processed in the calling thread
+    since starting the workers would cost more than it saves. Callers
+    processing several logs can pass their own executor to share its workers.
+    """
+    iterations = iter(iterations)
+    head = list(islice(iterations, POOL_MIN_ITERATIONS))
+    if len(head) < POOL_MIN_ITERATIONS:
+        for iteration_num, iteration_content in head:
+            yield iteration_num, iteration_content, process_iteration(
+                iteration_content, iteration_num, mode)
+        return
+    
+    pairs = head + list(iterations)
+    iteration_nums, iteration_contents = zip(*pairs)
+    workers = os.cpu_count() or 1
+    chunksize = max(1, len(pairs) // (workers * POOL_CHUNKS_PER_WORKER))
+    with _process_pool(len(pairs)) if executor is None else nullcontext(executor) as executor:
+        results = executor.map(process_iteration, iteration_contents, iteration_nums,
+                               repeat(mode), chunksize=chunksize)
+        for (iteration_num, iteration_content), result in zip(pairs, results):
+            yield iteration_num, iteration_content, result
+
+class BatchProcessor(QThread):
+    """Processes the batch log files off the GUI thread"""
+    file_failed = pyqtSignal(str, str)
+    batch_ready = pyqtSignal(object)
+    
+    def __init__(self, file_paths, mode="default", parent=None):
+        super().__init__(parent)
+        self.file_paths = list(file_paths)
+        self.mode = mode
+    
+    def run(self):
+        batch_results = []
+        
+        # Files are read on background threads while earlier ones are
+        # processed. The first file long enough for process_iterations to
+        # use a pool starts one, and it then serves the rest of the batch;
+        # batches of short files never start any workers.
+        executor = None
+        try:
+            for file_path, iterations in iter_read_files(self.file_paths):
+                try:
+                    iterations = iterations.result()
+                    if executor is None and len(iterations) >= POOL_MIN_ITERATIONS:
+                        executor = _process_pool(len(iterations))
+                    
+                    file_results = []
+                    
+                    for iteration_num, iteration_content, result in process_iterations(
+                            iterations, self.mode, executor):
+                        if result:
+                            result['original_log'] = iteration_content.strip()
+                            file_results.append(result)
+                    
+                    batch_results.append({
+                        'filename': os.path.basename(file_path),
+                        'results': file_results
+                    })
+                    
+                except Exception as e:
+                    self.file_failed.emit(file_path, str(e))
+        finally:
+            if executor is not None:
+                executor.shutdown()
+        
+        self.batch_ready.emit(batch_results)
 
 class LogProcessor(QThread):
     """Enhanced log processor with original log storage"""
@@ -115,299 +391,753 @@ class LogProcessor(QThread):
         try:
             self.progress_updated.emit(10)
             
-            # Split content into iterations while preserving original content
-            iterations = re.split(r'ITERATION_(\d+)', self.log_content)[1:]
-            
-            if not iterations:
-                iterations = ["01", self.log_content]
-            
-            self.progress_updated.emit(30)
-            
-            # Pair iteration numbers with content
-            iteration_pairs = []
-            for i in range(0, len(iterations), 2):
-                if i+1 < len(iterations):
-                    iteration_num = iterations[i]
-                    iteration_content = iterations[i+1]
-                    iteration_pairs.append((iteration_num, iteration_content))
+            results = []
+            total_iterations = 0
+            # Iterations are streamed, so progress follows how much of the
+            # log has been consumed rather than an iteration count
+            total_length = len(self.log_content) or 1
+            consumed = 0
             
             self.progress_updated.emit(50)
             
-            results = []
-            total_iterations = len(iteration_pairs)
-            
-            for idx, (iteration_num, iteration_content) in enumerate(iteration_pairs):
-                lines = iteration_content.split('\n')
-                result = self.process_iteration(lines, iteration_num, self.mode)
+            for iteration_num, iteration_content, result in self.process_iterations():
+                total_iterations += 1
                 
                 if result:
                     # Store original log content with the result
                     result['original_log'] = iteration_content.strip()
                     results.append(result)
                 
-                progress = 50 + (idx + 1) * 40 // total_iterations
+                consumed += len(iteration_content)
+                progress = 50 + consumed * 40 // total_length
                 self.progress_updated.emit(progress)
             
             self.progress_updated.emit(100)
-            self.result_ready.emit({'results': results, 'total_iterations': len(iteration_pairs)})
+            self.result_ready.emit({'results': results, 'total_iterations': total_iterations})
             
         except Exception as e:
             self.error_occurred.emit(str(e))
     
-    def process_iteration(self, lines, iteration_num, mode="default"):
-        """Process a single iteration with fixed suspend parsing"""
+    def process_iterations(self):
+        """Yield (iteration_num, iteration_content, result) in log order"""
+        return process_iterations(iter_iterations(self.log_content), self.mode)
+    
+    def process_iteration(self, iteration_content, iteration_num, mode="default"):
+        """Process a single iteration's log text with fixed suspend parsing"""
+        return process_iteration(iteration_content, iteration_num, mode)
+
+# resizeColumnsToContents measures the visible rows plus this many more,
+# instead of Qt's default of 1000, so refreshing a long table stays cheap
+TABLE_RESIZE_ROWS = 200
+
+class ResultsTableModel(QAbstractTableModel):
+    """Main Results table backed directly by the analyzer's result dicts
+
+    Cells are formatted in data() when the view asks for them, so only
+    the visible rows are touched instead of one item object per cell.
+    """
+    HEADERS = ['Iteration', 'Duration (seconds)', 'Start Time', 'Stop Time',
+               'Marker', 'Height', 'Selected Waveform', 'Mode']
+    # Duration and selected waveform columns
+    HIGHLIGHTED_COLUMNS = (1, 6)
+    HIGHLIGHT = QBrush(QColor(255, 255, 0, 100))  # Yellow highlighting
+    
+    def __init__(self, results=None, parent=None):
+        super().__init__(parent)
+        self.results = results if results is not None else []
+    
+    def set_results(self, results):
+        """Show a new results list"""
+        self.beginResetModel()
+        self.results = results
+        self.endResetModel()
+    
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.results)
+    
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+    
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
         
-        # Get appropriate parser
-        if mode == "suspend":
-            parser = FixedSuspendEventParser()
-        else:
-            # Use original parsers for default and swipe
-            if mode == "default":
-                parser = DefaultEventParser()
-            else:  # swipe
-                parser = SwipeEventParser()
-        
-        start_time = None
-        start_line = None  # Store the line that contains start time for highlighting
-        end_times_by_marker = {}
-        heights_by_marker = {}
-        current_marker = None
-        
-        for line in lines:
-            if not line.strip():
-                continue
-            
-            # Check for start time based on the parser's implementation
-            if not start_time:
-                possible_start = parser.extract_start_timestamp(line)
-                if possible_start:
-                    start_time = possible_start
-                    start_line = line.strip()  # Store the start line for highlighting
-            
-            marker = parser.extract_marker(line)
-            if marker:
-                current_marker = marker
-            
-            if "Sending update" in line and current_marker:
-                height_waveform = parser.extract_height_and_waveform(line)
-                if height_waveform:
-                    height = height_waveform['height']
-                    waveform = height_waveform['waveform']
-                    
-                    heights_by_marker[current_marker] = {
-                        'height': height,
-                        'waveform': waveform if waveform and waveform != "auto" else "unknown",
-                        'line': line.strip()
-                    }
-            
-            if "update end marker=" in line and "end time=" in line:
-                end_marker_match = re.search(r'update end marker=(\d+)', line)
-                if end_marker_match:
-                    end_marker = end_marker_match.group(1)
-                    end_time = parser.extract_end_timestamp(line)
-                    if end_time:
-                        end_times_by_marker[end_marker] = {
-                            'time': end_time,
-                            'line': line.strip()
-                        }
-        
-        if not start_time or not heights_by_marker or not end_times_by_marker:
+        column = index.column()
+        if role == Qt.DisplayRole:
+            result = self.results[index.row()]
+            if column == 0:
+                return str(result['iteration'])
+            if column == 1:
+                # Duration is already in seconds
+                return f"{result['duration']:.3f}"
+            if column == 2:
+                return str(result['start'])
+            if column == 3:
+                return str(result['stop'])
+            if column == 4:
+                return str(result['marker'])
+            if column == 5:
+                return str(result['max_height'])
+            if column == 6:
+                return result['max_height_waveform']
+            return result['mode']
+        
+        if role == Qt.BackgroundRole and column in self.HIGHLIGHTED_COLUMNS:
+            return self.HIGHLIGHT
+        return None
+    
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.HEADERS[section]
+        return super().headerData(section, orientation, role)
+
+class HeightsTableModel(QAbstractTableModel):
+    """Heights & Waveforms table with one row per marker height of every result"""
+    HEADERS = ['Iteration', 'Marker', 'Height', 'Waveform', 'Selected', 'End Time']
+    SELECTED_COLUMN = 4
+    HIGHLIGHT = QBrush(QColor(255, 255, 0, 150))  # Yellow highlighting
+    
+    def __init__(self, results=None, parent=None):
+        super().__init__(parent)
+        self.rows = self._flatten(results) if results else []
+    
+    @staticmethod
+    def _flatten(results):
+        return [(result, height_info)
+                for result in results for height_info in result['all_heights']]
+    
+    def set_results(self, results):
+        """Show the heights of a new results list"""
+        self.beginResetModel()
+        self.rows = self._flatten(results)
+        self.endResetModel()
+    
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.rows)
+    
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+    
+    def _is_selected(self, result, height_info):
+        # Mark if this is the selected marker for final calculation
+        return height_info.marker == result['marker']
+    
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
             return None
         
-        # Filter out markers with "unknown" waveforms
-        valid_heights = {
-            marker: info for marker, info in heights_by_marker.items() 
-            if info['waveform'].lower() != "unknown"
-        }
+        result, height_info = self.rows[index.row()]
+        column = index.column()
+        if role == Qt.DisplayRole:
+            if column == 0:
+                return str(result['iteration'])
+            if column == 1:
+                return str(height_info.marker)
+            if column == 2:
+                return str(height_info.height)
+            if column == 3:
+                return height_info.waveform
+            if column == self.SELECTED_COLUMN:
+                return "✓" if self._is_selected(result, height_info) else ""
+            # Show end time if available
+            marker = height_info.marker
+            if 'all_end_times' in result and marker in result['all_end_times']:
+                return str(result['all_end_times'][marker]['time'])
+            return ""
+        
+        if (role == Qt.BackgroundRole and column == self.SELECTED_COLUMN
+                and self._is_selected(result, height_info)):
+            return self.HIGHLIGHT
+        return None
+    
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.HEADERS[section]
+        return super().headerData(section, orientation, role)
+
+class BatchResultsTableModel(QAbstractTableModel):
+    """Batch Results table with one row per result of every processed file
+
+    Files without valid results get a single row saying so.
+    """
+    HEADERS = ['File', 'Iteration', 'Duration', 'Start', 'Stop', 'Height', 'Waveform']
+    # Duration and waveform columns
+    HIGHLIGHTED_COLUMNS = (2, 6)
+    HIGHLIGHT = QBrush(QColor(255, 255, 0))  # Yellow highlighting
+    
+    def __init__(self, batch_results=None, parent=None):
+        super().__init__(parent)
+        self.rows = self._flatten(batch_results) if batch_results else []
+    
+    @staticmethod
+    def _flatten(batch_results):
+        return [(batch['filename'], result)
+                for batch in batch_results for result in batch['results'] or (None,)]
+    
+    def set_batch_results(self, batch_results):
+        """Show the results of a new batch"""
+        self.beginResetModel()
+        self.rows = self._flatten(batch_results)
+        self.endResetModel()
+    
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.rows)
+    
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+    
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
         
-        # If no valid waveforms found, use all heights as a fallback
-        if not valid_heights:
-            valid_heights = heights_by_marker
+        filename, result = self.rows[index.row()]
+        column = index.column()
+        if role == Qt.DisplayRole:
+            if column == 0:
+                return filename
+            if result is None:
+                return "No valid results found." if column == 1 else ""
+            if column == 1:
+                return str(result['iteration'])
+            if column == 2:
+                return str(result['duration'])
+            if column == 3:
+                return str(result['start'])
+            if column == 4:
+                return str(result['stop'])
+            if column == 5:
+                return str(result['max_height'])
+            return result['max_height_waveform']
+        
+        if (role == Qt.BackgroundRole and column in self.HIGHLIGHTED_COLUMNS
+                and result is not None):
+            return self.HIGHLIGHT
+        return None
+    
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.HEADERS[section]
+        return super().headerData(section, orientation, role)
+
+class WaveformBoxDelegate(QStyledItemDelegate):
+    """Paints each result of a ResultsTableModel as an iteration waveform box
+
+    One painter draws every box instead of a frame holding a label per line
+    and a button per iteration. Clicks on a box's Copy Data button are
+    reported through copy_requested with the result's row.
+    """
+    copy_requested = pyqtSignal(int)
+    
+    BOX_WIDTH = 300
+    MARGIN = 5
+    PADDING = 10
+    HEADER_HEIGHT = 28
+    LINE_HEIGHT = 22
+    BUTTON_HEIGHT = 25
+    # (accent, text, box, header) colours, built once instead of per paint
+    LIGHT_COLORS = (QColor('#0d7377'), QColor('#333333'), QColor('#ffffff'), QColor('#f0f8ff'))
+    DARK_COLORS = (QColor('#14a085'), QColor('#ffffff'), QColor('#404040'), QColor('#2b2b2b'))
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.dark_mode = False
+    
+    @staticmethod
+    def _lines(result):
+        """(text, kind) for every line of a box below its header"""
+        lines = [
+            (f"⏱️ Duration: {result['duration']:.3f} seconds", 'highlight'),
+            (f"🎯 Selected: {result['max_height_waveform']}", 'highlight'),
+            (f"🔢 {result['start']} → {result['stop']}", 'mono'),
+            ("📏 All Heights:", 'plain'),
+        ]
+        for height_info in result['all_heights']:
+            is_selected = height_info.marker == result['marker']
+            height_text = f"M{height_info.marker}: {height_info.height}px, {height_info.waveform}"
+            lines.append((height_text, 'highlight' if is_selected else 'small'))
+        return lines
+    
+    def _button_rect(self, rect):
+        box = rect.adjusted(self.MARGIN, self.MARGIN, -self.MARGIN, -self.MARGIN)
+        return QRect(box.left() + self.PADDING, box.bottom() - self.PADDING - self.BUTTON_HEIGHT,
+                     box.width() - 2 * self.PADDING, self.BUTTON_HEIGHT)
+    
+    def sizeHint(self, option, index):
+        result = index.model().results[index.row()]
+        height = (2 * (self.MARGIN + self.PADDING) + self.HEADER_HEIGHT
+                  + (len(self._lines(result)) + 1) * self.LINE_HEIGHT + self.BUTTON_HEIGHT)
+        return QSize(self.BOX_WIDTH, height)
+    
+    def paint(self, painter, option, index):
+        result = index.model().results[index.row()]
+        accent, text_color, box_color, header_color = (
+            self.DARK_COLORS if self.dark_mode else self.LIGHT_COLORS)
         
-        # Find the marker with the maximum height among valid waveforms
-        max_height = max(info['height'] for info in valid_heights.values())
-        max_height_markers = [marker for marker, info in valid_heights.items() 
-                             if info['height'] == max_height]
+        painter.save()
+        painter.setRenderHint(QPainter.Antialiasing)
         
-        max_height_markers.sort(key=lambda m: int(m) if m.isdigit() else 0)
-        chosen_marker = max_height_markers[-1] if max_height_markers else list(valid_heights.keys())[0]
+        box = option.rect.adjusted(self.MARGIN, self.MARGIN, -self.MARGIN, -self.MARGIN)
+        painter.setPen(QPen(accent, 2))
+        painter.setBrush(box_color)
+        painter.drawRoundedRect(box, 8, 8)
         
-        max_height_info = valid_heights[chosen_marker]
+        left = box.left() + self.PADDING
+        width = box.width() - 2 * self.PADDING
+        top = box.top() + self.PADDING
         
-        # Get the end time for the chosen marker
-        if chosen_marker in end_times_by_marker:
-            max_height_end_time = end_times_by_marker[chosen_marker]['time']
-        else:
-            # If no end time for the chosen marker, use the maximum end time
-            if end_times_by_marker:
-                max_height_end_time = max(end_times_by_marker.values(), key=lambda x: x['time'])['time']
+        # Header
+        header_rect = QRect(left, top, width, self.HEADER_HEIGHT)
+        painter.setPen(Qt.NoPen)
+        painter.setBrush(header_color)
+        painter.drawRoundedRect(header_rect, 4, 4)
+        font = QFont(option.font)
+        font.setBold(True)
+        font.setPixelSize(14)
+        painter.setFont(font)
+        painter.setPen(accent)
+        painter.drawText(header_rect, Qt.AlignCenter, f"🔄 ITERATION_{result['iteration']:02d}")
+        top += self.HEADER_HEIGHT + self.LINE_HEIGHT // 2
+        
+        for text, kind in self._lines(result):
+            line_rect = QRect(left, top, width, self.LINE_HEIGHT)
+            font = QFont(option.font)
+            font.setPixelSize(11 if kind in ('mono', 'small') else 12)
+            if kind == 'mono':
+                font.setFamily('monospace')
+            if kind == 'highlight':
+                # Duration, selected waveform and selected height in yellow
+                font.setBold(True)
+                painter.fillRect(line_rect, Qt.yellow)
+                painter.setPen(Qt.black)
             else:
-                return None
-        
-        # Calculate duration
-        duration = max_height_end_time - start_time
-        if duration < 0:
-            duration = abs(duration)
-
-        # Convert duration from milliseconds to seconds
-        duration = duration / 1000.0
-
-        return {
-            'iteration': int(iteration_num),  # Convert to integer here
-            'start': start_time,
-            'stop': max_height_end_time,
-            'marker': chosen_marker,
-            'duration': duration,
-            'max_height': max_height_info['height'],
-            'max_height_waveform': max_height_info['waveform'],
-            'start_line': start_line,  # For PDF highlighting
-            'all_heights': [{'marker': m, 'height': h['height'], 'waveform': h['waveform']} 
-                           for m, h in heights_by_marker.items()],
-            'mode': mode,
-            'all_end_times': end_times_by_marker
-        }
-
-class DefaultEventParser:
-    """Parser for default mode (Button Up)"""
-    
-    def extract_marker(self, line):
-        """Extract marker number from log line"""
-        match1 = re.search(r'EPDC\]\[(\d+)\]', line)
-        if match1:
-            return match1.group(1)
-        
-        match2 = re.search(r'mxc_epdc_fb: \[(\d+)\]', line)
-        if match2:
-            return match2.group(1)
-        
-        return None
-
-    def extract_height_and_waveform(self, line):
-        """Extract height and waveform information from log line"""
-        height_match = re.search(r'height=(\d+)', line)
-        if not height_match:
-            height_match = re.search(r'width=\d+, height=(\d+)', line)
-        
-        waveform_patterns = [
-            r'new waveform = (?:0x)?[\da-f]+ \(([\w_() ]+)\)', 
-            r'waveform:(?:0x)?[\da-f]+ \(([\w_() ]+)\)',
-            r'waveform=(?:0x)?[\da-f]+ \(([\w_() ]+)\)',
-            r'Sending update\. waveform:(?:0x)?[\da-f]+ \(([\w_() ]+)\)'
-        ]
+                painter.setPen(text_color)
+            painter.setFont(font)
+            painter.drawText(line_rect.adjusted(3, 0, -3, 0), Qt.AlignLeft | Qt.AlignVCenter, text)
+            top += self.LINE_HEIGHT
         
-        waveform_name = None
-        for pattern in waveform_patterns:
-            match = re.search(pattern, line)
-            if match:
-                waveform_name = match.group(1).strip()
-                break
-        
-        if height_match:
-            height = int(height_match.group(1))
-            return {
-                'height': height,
-                'waveform': waveform_name if waveform_name else "unknown"
-            }
-        return None
-
-    def extract_end_timestamp(self, line):
-        """Extract end timestamp from log line"""
-        match = re.search(r'end time=(\d+)', line)
-        if match:
-            timestamp_str = match.group(1)
-            last_6 = timestamp_str[-6:]
-            return int(last_6)
-        return None
+        # Copy button for this iteration
+        button = QStyleOptionButton()
+        button.rect = self._button_rect(option.rect)
+        button.text = "📋 Copy Data"
+        button.state = QStyle.State_Enabled | QStyle.State_Raised
+        style = option.widget.style() if option.widget else QApplication.style()
+        painter.setFont(option.font)
+        style.drawControl(QStyle.CE_PushButton, button, painter, option.widget)
+        
+        painter.restore()
     
-    def extract_start_timestamp(self, line):
-        """Extract start timestamp from "button 1 up" event"""
-        match = re.search(r'button 1 up (\d+\.\d+)', line)
-        if match:
-            timestamp_str = match.group(1)
-            parts = timestamp_str.split('.')
-            if len(parts) == 2:
-                last_3_first = parts[0][-3:]
-                first_3_second = parts[1][:3]
-                result = int(last_3_first + first_3_second)
-                return result
-        return None
+    def editorEvent(self, event, model, option, index):
+        if (event.type() == QEvent.MouseButtonRelease and event.button() == Qt.LeftButton
+                and self._button_rect(option.rect).contains(event.pos())):
+            self.copy_requested.emit(index.row())
+            return True
+        return super().editorEvent(event, model, option, index)
+
+def _txt_quick_copy_line(label, result):
+    """Format one tab-separated row of the TXT report's quick copy table"""
+    return (f"{label}\t{result['duration']}\t{result['start']}\t"
+            f"{result['stop']}\t{result['marker']}\t{result['max_height']}\t"
+            f"{result['max_height_waveform']}\t{result['mode']}\n")
+
+def _txt_iteration_lines(result, indent, rule, header_rule, footer_rule):
+    """Yield the detailed TXT report lines for one result
+
+    Single entry and batch reports share this layout; batch entries are
+    indented under their file and use shorter rules.
+    """
+    yield f"{indent}ITERATION_{result['iteration']:02d}\n"
+    yield f"{indent}{header_rule}\n\n"
+
+    # Original log content
+    yield f"{indent}ORIGINAL LOG DATA:\n"
+    yield f"{indent}{rule}\n"
+
+    if 'original_log' in result:
+        for line in result['original_log'].split('\n'):
+            if line and not line.isspace():
+                # Mark the start line with highlighting annotation
+                if 'start_line' in result and result['start_line'] in line:
+                    yield f"{indent}>>> START POINT >>> {line}\n"
+                else:
+                    yield f"{indent}{line}\n"
+    else:
+        yield f"{indent}Original log data not available\n"
+
+    yield "\n"
+    yield f"{indent}CALCULATION RESULTS:\n"
+    yield f"{indent}{rule}\n"
+    yield f"{indent}Start Time: {result['start']}\n"
+    yield f"{indent}Stop Time: {result['stop']}\n"
+    yield f"{indent}Duration: {result['duration'] / 1000:.3f} seconds [SELECTED]\n"
+    yield f"{indent}Selected Marker: {result['marker']}\n"
+    yield f"{indent}Selected Height: {result['max_height']}px\n"
+    yield f"{indent}Selected Waveform: {result['max_height_waveform']} [HIGHLIGHTED]\n\n"
+
+    yield f"{indent}ALL HEIGHTS & WAVEFORMS:\n"
+    yield f"{indent}{rule}\n"
+    selected_marker = result['marker']
+    for height_info in result['all_heights']:
+        marker = height_info.marker
+        selected = " [SELECTED FOR CALCULATION]" if marker == selected_marker else ""
+        yield f"{indent}  Marker {marker}: {height_info.height}px, {height_info.waveform}{selected}\n"
+
+    if 'all_end_times' in result:
+        yield f"\n{indent}END TIMES BY MARKER:\n"
+        yield f"{indent}{rule}\n"
+        for marker, end_info in result['all_end_times'].items():
+            selected = " [SELECTED]" if marker == selected_marker else ""
+            yield f"{indent}  Marker {marker}: {end_info['time']}{selected}\n"
+
+    yield f"\n{indent}{footer_rule}\n\n"
+
+def write_enhanced_txt_report(filename, results, batch_results, test_case, mode_text):
+    """Write the enhanced TXT report with original logs for each iteration
+
+    results are used when non-empty (single entry mode), otherwise
+    batch_results. Returns (success, message) like the other exporters.
+    """
+    try:
+        # The report is written as many small pieces, so give the
+        # file a large buffer to turn them into a few big writes
+        with open(filename, 'w', encoding='utf-8', buffering=REPORT_BUFFER_SIZE) as f:
+            f.write("=" * 100 + "\n")
+            f.write("KINDLE LOG ANALYZER - ENHANCED REPORT WITH ORIGINAL LOGS\n")
+            f.write("=" * 100 + "\n\n")
+
+            # Write test case info
+            f.write(f"Test Case: {test_case or 'Not specified'}\n")
+            f.write(f"Processing Mode: {mode_text}\n")
+            f.write(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
+
+            # Determine which data to use and write appropriate summary
+            if results:
+                # Single entry mode
+                f.write(f"Total Iterations: {len(results)}\n\n")
+
+                # Summary statistics for single mode
+                durations = [r['duration'] for r in results]
+                f.write("SUMMARY STATISTICS:\n")
+                f.write("-" * 50 + "\n")
+                f.write(f"Average Duration: {sum(durations)/len(durations)/1000:.3f} seconds\n")
+                f.write(f"Min Duration: {min(durations)/1000:.3f} seconds\n")
+                f.write(f"Max Duration: {max(durations)/1000:.3f} seconds\n\n")
+            else:
+                # Batch mode
+                # One pass over the batches gives both the iteration count
+                # and the durations for the summary statistics
+                all_durations = [result['duration'] for batch in batch_results
+                                 for result in batch['results']]
+                f.write(f"Total Files Processed: {len(batch_results)}\n")
+                f.write(f"Total Iterations: {len(all_durations)}\n\n")
+
+                # Summary statistics for batch mode
+
+                if all_durations:
+                    f.write("SUMMARY STATISTICS:\n")
+                    f.write("-" * 50 + "\n")
+                    f.write(f"Average Duration: {sum(all_durations)/1000/len(all_durations):.3f} seconds\n")
+                    f.write(f"Min Duration: {min(all_durations)/1000:.3f} seconds\n")
+                    f.write(f"Max Duration: {max(all_durations)/1000:.3f} seconds\n\n")
+
+            # Quick copy table
+            f.write("QUICK COPY TABLE (Copy-friendly for Excel):\n")
+            f.write("-" * 80 + "\n")
+            f.write("Iteration\tDuration(sec)\tStart\tStop\tMarker\tHeight\tWaveform\tMode\n")
+            f.write("-" * 80 + "\n")
+
+            # Write data based on mode
+            if results:
+                # Single entry mode
+                f.writelines(_txt_quick_copy_line(result['iteration'], result) for result in results)
+            else:
+                # Batch mode
+                f.writelines(_txt_quick_copy_line(f"{batch['filename']}_iter{result['iteration']}", result)
+                             for batch in batch_results for result in batch['results'])
+
+            f.write("\n" + "=" * 100 + "\n")
+            f.write("DETAILED ITERATION ANALYSIS WITH ORIGINAL LOGS\n")
+            f.write("=" * 100 + "\n\n")
+
+            # Write detailed analysis based on mode
+            if results:
+                # Single entry mode
+                for result in results:
+                    f.writelines(_txt_iteration_lines(result, "", "-" * 30, "=" * 50, "=" * 50))
+            else:
+                # Batch mode
+                for batch in batch_results:
+                    f.write(f"FILE: {batch['filename']}\n")
+                    f.write("=" * 60 + "\n\n")
+
+                    if batch['results']:
+                        for result in batch['results']:
+                            f.writelines(_txt_iteration_lines(result, "  ", "-" * 20, "-" * 40, "=" * 40))
+                    else:
+                        f.write("  No valid results found in this file.\n\n")
 
-class SwipeEventParser:
-    """Parser for swipe mode (Button Down)"""
+            f.write("=" * 100 + "\n")
+            f.write("END OF ENHANCED REPORT\n")
+            f.write("=" * 100 + "\n")
+    except Exception as e:
+        return False, f"Failed to save enhanced TXT report: {str(e)}"
     
-    def extract_marker(self, line):
-        """Extract marker number from log line"""
-        match1 = re.search(r'EPDC\]\[(\d+)\]', line)
-        if match1:
-            return match1.group(1)
-        
-        match2 = re.search(r'mxc_epdc_fb: \[(\d+)\]', line)
-        if match2:
-            return match2.group(1)
-        
-        return None
+    return True, f"Enhanced TXT report with original logs saved to:\n{filename}"
 
-    def extract_height_and_waveform(self, line):
-        """Extract height and waveform information from log line"""
-        height_match = re.search(r'height=(\d+)', line)
-        if not height_match:
-            height_match = re.search(r'width=\d+, height=(\d+)', line)
-        
-        waveform_patterns = [
-            r'new waveform = (?:0x)?[\da-f]+ \(([\w_() ]+)\)', 
-            r'waveform:(?:0x)?[\da-f]+ \(([\w_() ]+)\)',
-            r'waveform=(?:0x)?[\da-f]+ \(([\w_() ]+)\)',
-            r'Sending update\. waveform:(?:0x)?[\da-f]+ \(([\w_() ]+)\)'
-        ]
-        
-        waveform_name = None
-        for pattern in waveform_patterns:
-            match = re.search(pattern, line)
-            if match:
-                waveform_name = match.group(1).strip()
-                break
-        
-        if height_match:
-            height = int(height_match.group(1))
-            return {
-                'height': height,
-                'waveform': waveform_name if waveform_name else "unknown"
-            }
-        return None
+class ReportExportThread(QThread):
+    """Run a report export off the GUI thread
 
-    def extract_end_timestamp(self, line):
-        """Extract end timestamp from log line"""
-        match = re.search(r'end time=(\d+)', line)
-        if match:
-            timestamp_str = match.group(1)
-            last_6 = timestamp_str[-6:]
-            return int(last_6)
-        return None
+    export is called with args and returns (success, message), which is
+    passed on through export_finished.
+    """
+    export_finished = pyqtSignal(bool, str)
     
-    def extract_start_timestamp(self, line):
-        """Extract start timestamp from "Sending button 1 down" event"""
-        match = re.search(r'Sending button 1 down (\d+\.\d+)', line)
-        if match:
-            timestamp_str = match.group(1)
-            parts = timestamp_str.split('.')
-            if len(parts) == 2:
-                last_3_first = parts[0][-3:]
-                first_3_second = parts[1][:3]
-                result = int(last_3_first + first_3_second)
-                return result
-        return None
+    def __init__(self, export, *args):
+        super().__init__()
+        self.export = export
+        self.args = args
+    
+    def run(self):
+        try:
+            success, message = self.export(*self.args)
+        except Exception as e:
+            success, message = False, str(e)
+        self.export_finished.emit(success, message)
+
+# Calculation mode combo entries to internal parser modes
+_MODE_BY_INDEX = {0: "default", 1: "swipe", 2: "suspend"}
+_MODE_BY_TEXT = {"Default (Button Up)": "default",
+                 "Swipe (Button Down)": "swipe",
+                 "Suspend (Power Button - FIXED)": "suspend"}
+
+# Window stylesheets for dark and light mode, built once per process
+_DARK_QSS = """
+    QMainWindow {
+        background-color: #2b2b2b;
+        color: #ffffff;
+    }
+    QWidget {
+        background-color: #2b2b2b;
+        color: #ffffff;
+    }
+    QGroupBox {
+        font-weight: bold;
+        border: 2px solid #555555;
+        border-radius: 8px;
+        margin: 8px 0px;
+        padding-top: 10px;
+        background-color: #3c3c3c;
+        color: #ffffff;
+    }
+    QGroupBox::title {
+        subcontrol-origin: margin;
+        left: 10px;
+        padding: 0 8px 0 8px;
+        color: #ffffff;
+    }
+    QPushButton {
+        background-color: #0d7377;
+        color: white;
+        border: none;
+        padding: 10px 16px;
+        border-radius: 6px;
+        font-weight: bold;
+    }
+    QPushButton:hover {
+        background-color: #14a085;
+    }
+    QPushButton:pressed {
+        background-color: #0a5d61;
+    }
+    QPushButton:disabled {
+        background-color: #555555;
+        color: #888888;
+    }
+    QLineEdit, QTextEdit, QComboBox {
+        border: 2px solid #555555;
+        border-radius: 4px;
+        padding: 8px;
+        background-color: #404040;
+        color: #ffffff;
+    }
+    QLineEdit:focus, QTextEdit:focus, QComboBox:focus {
+        border-color: #0d7377;
+    }
+    QTableView {
+        background-color: #404040;
+        alternate-background-color: #4a4a4a;
+        color: #ffffff;
+        gridline-color: #555555;
+        selection-background-color: #0d7377;
+        selection-color: #ffffff;
+    }
+    QHeaderView::section {
+        background-color: #0d7377;
+        color: white;
+        padding: 8px;
+        border: 1px solid #555555;
+        font-weight: bold;
+    }
+    QTabWidget::pane {
+        border: 1px solid #555555;
+        background-color: #3c3c3c;
+    }
+    QTabBar::tab {
+        background: #505050;
+        color: #ffffff;
+        padding: 10px 16px;
+        margin-right: 2px;
+        border-top-left-radius: 4px;
+        border-top-right-radius: 4px;
+    }
+    QTabBar::tab:selected {
+        background: #0d7377;
+        color: white;
+    }
+    QListWidget {
+        background-color: #404040;
+        color: #ffffff;
+        border: 2px solid #555555;
+    }
+    QProgressBar {
+        border: 2px solid #555555;
+        border-radius: 5px;
+        background-color: #404040;
+    }
+    QProgressBar::chunk {
+        background-color: #0d7377;
+        border-radius: 3px;
+    }
+    QScrollArea, QListView#waveformBoxes {
+        background-color: #3c3c3c;
+        border: 1px solid #555555;
+    }
+    QLabel {
+        color: #ffffff;
+    }
+"""
+
+_LIGHT_QSS = """
+    QMainWindow {
+        background-color: #f0f0f0;
+        color: #333333;
+    }
+    QWidget {
+        background-color: #f0f0f0;
+        color: #333333;
+    }
+    QGroupBox {
+        font-weight: bold;
+        border: 2px solid #cccccc;
+        border-radius: 8px;
+        margin: 8px 0px;
+        padding-top: 10px;
+        background-color: #ffffff;
+        color: #333333;
+    }
+    QGroupBox::title {
+        subcontrol-origin: margin;
+        left: 10px;
+        padding: 0 8px 0 8px;
+        color: #333333;
+    }
+    QPushButton {
+        background-color: #4a90e2;
+        color: white;
+        border: none;
+        padding: 10px 16px;
+        border-radius: 6px;
+        font-weight: bold;
+    }
+    QPushButton:hover {
+        background-color: #357abd;
+    }
+    QPushButton:pressed {
+        background-color: #2968a3;
+    }
+    QPushButton:disabled {
+        background-color: #cccccc;
+        color: #666666;
+    }
+    QLineEdit, QTextEdit, QComboBox {
+        border: 2px solid #cccccc;
+        border-radius: 4px;
+        padding: 8px;
+        background-color: #ffffff;
+        color: #333333;
+    }
+    QLineEdit:focus, QTextEdit:focus, QComboBox:focus {
+        border-color: #4a90e2;
+    }
+    QTableView {
+        background-color: #ffffff;
+        alternate-background-color: #f8f9fa;
+        color: #333333;
+        gridline-color: #e1e8ed;
+        selection-background-color: #4a90e2;
+        selection-color: #ffffff;
+    }
+    QHeaderView::section {
+        background-color: #4a90e2;
+        color: white;
+        padding: 8px;
+        border: 1px solid #cccccc;
+        font-weight: bold;
+    }
+    QTabWidget::pane {
+        border: 1px solid #cccccc;
+        background-color: #ffffff;
+        border-radius: 4px;
+    }
+    QTabBar::tab {
+        background: #e0e0e0;
+        color: #333333;
+        padding: 10px 16px;
+        margin-right: 2px;
+        border-top-left-radius: 4px;
+        border-top-right-radius: 4px;
+    }
+    QTabBar::tab:selected {
+        background: #4a90e2;
+        color: white;
+    }
+    QListWidget {
+        background-color: #ffffff;
+        color: #333333;
+        border: 2px solid #cccccc;
+    }
+    QProgressBar {
+        border: 2px solid #cccccc;
+        border-radius: 5px;
+        background-color: #ffffff;
+    }
+    QProgressBar::chunk {
+        background-color: #4a90e2;
+        border-radius: 3px;
+    }
+    QScrollArea, QListView#waveformBoxes {
+        background-color: #ffffff;
+        border: 1px solid #cccccc;
+    }
+    QLabel {
+        color: #333333;
+    }
+"""
 
 class FinalKindleLogAnalyzer(QMainWindow):
     def __init__(self):
         super().__init__()
         self.results = []
         self.current_iteration = 1
-        self.all_iterations_data = ""
+        self.all_iterations_chunks = []  # Pieces of the added iterations' text
         self.test_case_title = ""
         self.batch_results = []
+        self.flattened_batch_results = None  # Filled in by report_results()
         self.loaded_files = []
         self.current_mode = "default"
         self.dark_mode = False
+        self.report_export_thread = None
+        self.batch_processor = None
+        self.pdf_report_filename = ""
         
         self.setup_ui()
         self.setup_styling()
@@ -618,6 +1348,16 @@ class FinalKindleLogAnalyzer(QMainWindow):
         # Batch Results Tab
         self.create_batch_results_tab()
         
+        # Result tabs are refreshed when they are shown, not all at once
+        self.tab_updaters = {
+            self.summary_tab: self.update_summary_display,
+            self.results_tab: self.update_results_table,
+            self.waveform_boxes_tab: self.update_waveform_boxes,
+            self.heights_tab: self.update_heights_table,
+        }
+        self.stale_tabs = set()
+        self.tab_widget.currentChanged.connect(self.refresh_current_tab)
+        
         layout.addWidget(self.tab_widget)
         panel.setLayout(layout)
         return panel
@@ -642,10 +1382,13 @@ class FinalKindleLogAnalyzer(QMainWindow):
         layout.addWidget(QLabel("📋 Main Results (Copy-friendly for Excel)"))
         
         # Main results table - optimized for copying to Excel
-        self.results_table = QTableWidget()
+        self.results_model = ResultsTableModel(parent=self)
+        self.results_table = QTableView()
+        self.results_table.setModel(self.results_model)
         self.results_table.setAlternatingRowColors(True)
         self.results_table.setSelectionBehavior(QAbstractItemView.SelectRows)
         self.results_table.horizontalHeader().setStretchLastSection(True)
+        self.results_table.horizontalHeader().setResizeContentsPrecision(TABLE_RESIZE_ROWS)
         layout.addWidget(self.results_table)
         
         self.results_tab.setLayout(layout)
@@ -658,17 +1401,22 @@ class FinalKindleLogAnalyzer(QMainWindow):
         
         layout.addWidget(QLabel("📦 Waveform Boxes - Visual Grid Layout"))
         
-        # Scrollable area for the boxes
-        scroll_area = QScrollArea()
-        scroll_widget = QWidget()
-        
-        # Grid layout for iteration boxes
-        self.waveform_grid = QGridLayout(scroll_widget)
-        self.waveform_grid.setSpacing(10)
-        
-        scroll_area.setWidget(scroll_widget)
-        scroll_area.setWidgetResizable(True)
-        layout.addWidget(scroll_area)
+        # Boxes are painted by a delegate and wrap into rows as wide as
+        # the tab allows
+        self.waveform_boxes_model = ResultsTableModel(parent=self)
+        self.waveform_box_delegate = WaveformBoxDelegate(self)
+        self.waveform_box_delegate.copy_requested.connect(
+            lambda row: self.copy_iteration_data(self.waveform_boxes_model.results[row]))
+        self.waveform_boxes_view = QListView()
+        self.waveform_boxes_view.setObjectName("waveformBoxes")
+        self.waveform_boxes_view.setModel(self.waveform_boxes_model)
+        self.waveform_boxes_view.setItemDelegate(self.waveform_box_delegate)
+        self.waveform_boxes_view.setFlow(QListView.LeftToRight)
+        self.waveform_boxes_view.setWrapping(True)
+        self.waveform_boxes_view.setResizeMode(QListView.Adjust)
+        self.waveform_boxes_view.setSpacing(5)
+        self.waveform_boxes_view.setSelectionMode(QAbstractItemView.NoSelection)
+        layout.addWidget(self.waveform_boxes_view)
         
         self.waveform_boxes_tab.setLayout(layout)
         self.tab_widget.addTab(self.waveform_boxes_tab, "📦 Waveform Boxes")
@@ -681,9 +1429,12 @@ class FinalKindleLogAnalyzer(QMainWindow):
         layout.addWidget(QLabel("📏 All Heights & Waveforms Details"))
         
         # Detailed heights table
-        self.heights_table = QTableWidget()
+        self.heights_model = HeightsTableModel(parent=self)
+        self.heights_table = QTableView()
+        self.heights_table.setModel(self.heights_model)
         self.heights_table.setAlternatingRowColors(True)
         self.heights_table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.heights_table.horizontalHeader().setResizeContentsPrecision(TABLE_RESIZE_ROWS)
         layout.addWidget(self.heights_table)
         
         self.heights_tab.setLayout(layout)
@@ -694,115 +1445,26 @@ class FinalKindleLogAnalyzer(QMainWindow):
         self.batch_tab = QWidget()
         layout = QVBoxLayout()
         
-        self.batch_results_text = QTextEdit()
-        self.batch_results_text.setReadOnly(True)
-        layout.addWidget(self.batch_results_text)
+        self.batch_results_model = BatchResultsTableModel(parent=self)
+        self.batch_results_table = QTableView()
+        self.batch_results_table.setModel(self.batch_results_model)
+        self.batch_results_table.setAlternatingRowColors(True)
+        self.batch_results_table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.batch_results_table.horizontalHeader().setStretchLastSection(True)
+        self.batch_results_table.horizontalHeader().setResizeContentsPrecision(TABLE_RESIZE_ROWS)
+        layout.addWidget(self.batch_results_table)
         
         self.batch_tab.setLayout(layout)
         self.tab_widget.addTab(self.batch_tab, "📁 Batch Results")
     
-    def create_iteration_waveform_box(self, result):
-        """Create a visual box for each iteration's waveform data"""
-        box = QFrame()
-        box.setFrameStyle(QFrame.StyledPanel)
-        box.setStyleSheet(f"""
-        QFrame {{
-            border: 2px solid {'#0d7377' if not self.dark_mode else '#14a085'};
-            border-radius: 8px;
-            padding: 10px;
-            margin: 5px;
-            background-color: {'#ffffff' if not self.dark_mode else '#404040'};
-        }}
-        QLabel {{
-            color: {'#333333' if not self.dark_mode else '#ffffff'};
-            font-size: 12px;
-        }}
-        """)
-        
-        layout = QVBoxLayout(box)
-        
-        # Header
-        header_label = QLabel(f"🔄 ITERATION_{result['iteration']:02d}")
-        header_label.setStyleSheet(f"""
-            font-weight: bold; 
-            font-size: 14px; 
-            color: {'#0d7377' if not self.dark_mode else '#14a085'};
-            padding: 5px;
-            background-color: {'#f0f8ff' if not self.dark_mode else '#2b2b2b'};
-            border-radius: 4px;
-        """)
-        header_label.setAlignment(Qt.AlignCenter)
-        layout.addWidget(header_label)
-        
-        # Duration - highlighted
-        duration_label = QLabel(f"⏱️ Duration: {result['duration']:.3f} seconds")
-        duration_label.setStyleSheet(f"""
-            font-weight: bold;
-            background-color: yellow;
-            color: black;
-            padding: 3px;
-            border-radius: 3px;
-        """)
-        layout.addWidget(duration_label)
-        
-        # Selected waveform - highlighted
-        selected_label = QLabel(f"🎯 Selected: {result['max_height_waveform']}")
-        selected_label.setStyleSheet(f"""
-            font-weight: bold; 
-            background-color: yellow; 
-            color: black;
-            padding: 3px;
-            border-radius: 3px;
-        """)
-        layout.addWidget(selected_label)
-        
-        # Start/Stop info
-        times_label = QLabel(f"🔢 {result['start']} → {result['stop']}")
-        times_label.setStyleSheet("font-family: monospace; font-size: 11px;")
-        layout.addWidget(times_label)
-        
-        # All heights and waveforms
-        layout.addWidget(QLabel("📏 All Heights:"))
-        
-        for height_info in result['all_heights']:
-            is_selected = str(height_info['marker']) == str(result['marker'])
-            height_text = f"M{height_info['marker']}: {height_info['height']}px, {height_info['waveform']}"
-            
-            height_label = QLabel(height_text)
-            if is_selected:
-                height_label.setStyleSheet("""
-                    background-color: yellow; 
-                    color: black; 
-                    font-weight: bold; 
-                    padding: 2px;
-                    border-radius: 2px;
-                """)
-            else:
-                height_label.setStyleSheet("font-size: 11px; padding: 1px;")
-            
-            layout.addWidget(height_label)
-        
-        # Copy button for this iteration
-        copy_btn = QPushButton("📋 Copy Data")
-        copy_btn.setMaximumHeight(25)
-        copy_btn.clicked.connect(lambda checked, r=result: self.copy_iteration_data(r))
-        layout.addWidget(copy_btn)
-        
-        return box
-    
     def copy_iteration_data(self, result):
         """Copy iteration data to clipboard in the requested format"""
-        # Create a list to store the height and waveform information
-
-        # Iterate through all heights and extract the required information with numbering
-        height_waveform_data = []
-        for idx, height_info in enumerate(result['all_heights'], 1):
-            height = height_info['height']
-            waveform = height_info['waveform']
-            height_waveform_data.append(f"{idx}. Height - {height}, Waveform - {waveform}")
-
-        # Join all entries with newlines
-        data = "\n".join(height_waveform_data)
+        # One numbered "Height - ..., Waveform - ..." line per height, joined
+        # with newlines straight from the rows
+        data = "\n".join(
+            f"{idx}. Height - {height_info.height}, Waveform - {height_info.waveform}"
+            for idx, height_info in enumerate(result['all_heights'], 1)
+        )
 
         QApplication.clipboard().setText(data)
         self.status_label.setText(f"Copied Iteration {result['iteration']} waveform data to clipboard")
@@ -812,252 +1474,23 @@ class FinalKindleLogAnalyzer(QMainWindow):
         if not self.results:
             return
         
-        # Clear existing boxes
-        for i in reversed(range(self.waveform_grid.count())): 
-            self.waveform_grid.itemAt(i).widget().setParent(None)
-        
-        # Add new boxes in a 3-column grid
-        cols = 3
-        for idx, result in enumerate(self.results):
-            row = idx // cols
-            col = idx % cols
-            
-            box = self.create_iteration_waveform_box(result)
-            self.waveform_grid.addWidget(box, row, col)
-        
-        # Add stretch to fill remaining space
-        self.waveform_grid.setRowStretch(len(self.results) // cols + 1, 1)
+        self.waveform_boxes_model.set_results(self.results)
     
     def toggle_dark_mode(self, checked):
         """Toggle between dark and light mode"""
         self.dark_mode = checked
         self.setup_styling()
-        # Update waveform boxes with new styling
-        if self.results:
-            self.update_waveform_boxes()
+        # Repaint waveform boxes with the new colours
+        self.waveform_box_delegate.dark_mode = checked
+        self.waveform_boxes_view.viewport().update()
     
     def setup_styling(self):
         """Setup styling with dark mode support"""
-        if self.dark_mode:
-            # Dark mode styling
-            self.setStyleSheet("""
-                QMainWindow {
-                    background-color: #2b2b2b;
-                    color: #ffffff;
-                }
-                QWidget {
-                    background-color: #2b2b2b;
-                    color: #ffffff;
-                }
-                QGroupBox {
-                    font-weight: bold;
-                    border: 2px solid #555555;
-                    border-radius: 8px;
-                    margin: 8px 0px;
-                    padding-top: 10px;
-                    background-color: #3c3c3c;
-                    color: #ffffff;
-                }
-                QGroupBox::title {
-                    subcontrol-origin: margin;
-                    left: 10px;
-                    padding: 0 8px 0 8px;
-                    color: #ffffff;
-                }
-                QPushButton {
-                    background-color: #0d7377;
-                    color: white;
-                    border: none;
-                    padding: 10px 16px;
-                    border-radius: 6px;
-                    font-weight: bold;
-                }
-                QPushButton:hover {
-                    background-color: #14a085;
-                }
-                QPushButton:pressed {
-                    background-color: #0a5d61;
-                }
-                QPushButton:disabled {
-                    background-color: #555555;
-                    color: #888888;
-                }
-                QLineEdit, QTextEdit, QComboBox {
-                    border: 2px solid #555555;
-                    border-radius: 4px;
-                    padding: 8px;
-                    background-color: #404040;
-                    color: #ffffff;
-                }
-                QLineEdit:focus, QTextEdit:focus, QComboBox:focus {
-                    border-color: #0d7377;
-                }
-                QTableWidget {
-                    background-color: #404040;
-                    alternate-background-color: #4a4a4a;
-                    color: #ffffff;
-                    gridline-color: #555555;
-                    selection-background-color: #0d7377;
-                    selection-color: #ffffff;
-                }
-                QHeaderView::section {
-                    background-color: #0d7377;
-                    color: white;
-                    padding: 8px;
-                    border: 1px solid #555555;
-                    font-weight: bold;
-                }
-                QTabWidget::pane {
-                    border: 1px solid #555555;
-                    background-color: #3c3c3c;
-                }
-                QTabBar::tab {
-                    background: #505050;
-                    color: #ffffff;
-                    padding: 10px 16px;
-                    margin-right: 2px;
-                    border-top-left-radius: 4px;
-                    border-top-right-radius: 4px;
-                }
-                QTabBar::tab:selected {
-                    background: #0d7377;
-                    color: white;
-                }
-                QListWidget {
-                    background-color: #404040;
-                    color: #ffffff;
-                    border: 2px solid #555555;
-                }
-                QProgressBar {
-                    border: 2px solid #555555;
-                    border-radius: 5px;
-                    background-color: #404040;
-                }
-                QProgressBar::chunk {
-                    background-color: #0d7377;
-                    border-radius: 3px;
-                }
-                QScrollArea {
-                    background-color: #3c3c3c;
-                    border: 1px solid #555555;
-                }
-                QLabel {
-                    color: #ffffff;
-                }
-            """)
-        else:
-            # Light mode styling
-            self.setStyleSheet("""
-                QMainWindow {
-                    background-color: #f0f0f0;
-                    color: #333333;
-                }
-                QWidget {
-                    background-color: #f0f0f0;
-                    color: #333333;
-                }
-                QGroupBox {
-                    font-weight: bold;
-                    border: 2px solid #cccccc;
-                    border-radius: 8px;
-                    margin: 8px 0px;
-                    padding-top: 10px;
-                    background-color: #ffffff;
-                    color: #333333;
-                }
-                QGroupBox::title {
-                    subcontrol-origin: margin;
-                    left: 10px;
-                    padding: 0 8px 0 8px;
-                    color: #333333;
-                }
-                QPushButton {
-                    background-color: #4a90e2;
-                    color: white;
-                    border: none;
-                    padding: 10px 16px;
-                    border-radius: 6px;
-                    font-weight: bold;
-                }
-                QPushButton:hover {
-                    background-color: #357abd;
-                }
-                QPushButton:pressed {
-                    background-color: #2968a3;
-                }
-                QPushButton:disabled {
-                    background-color: #cccccc;
-                    color: #666666;
-                }
-                QLineEdit, QTextEdit, QComboBox {
-                    border: 2px solid #cccccc;
-                    border-radius: 4px;
-                    padding: 8px;
-                    background-color: #ffffff;
-                    color: #333333;
-                }
-                QLineEdit:focus, QTextEdit:focus, QComboBox:focus {
-                    border-color: #4a90e2;
-                }
-                QTableWidget {
-                    background-color: #ffffff;
-                    alternate-background-color: #f8f9fa;
-                    color: #333333;
-                    gridline-color: #e1e8ed;
-                    selection-background-color: #4a90e2;
-                    selection-color: #ffffff;
-                }
-                QHeaderView::section {
-                    background-color: #4a90e2;
-                    color: white;
-                    padding: 8px;
-                    border: 1px solid #cccccc;
-                    font-weight: bold;
-                }
-                QTabWidget::pane {
-                    border: 1px solid #cccccc;
-                    background-color: #ffffff;
-                    border-radius: 4px;
-                }
-                QTabBar::tab {
-                    background: #e0e0e0;
-                    color: #333333;
-                    padding: 10px 16px;
-                    margin-right: 2px;
-                    border-top-left-radius: 4px;
-                    border-top-right-radius: 4px;
-                }
-                QTabBar::tab:selected {
-                    background: #4a90e2;
-                    color: white;
-                }
-                QListWidget {
-                    background-color: #ffffff;
-                    color: #333333;
-                    border: 2px solid #cccccc;
-                }
-                QProgressBar {
-                    border: 2px solid #cccccc;
-                    border-radius: 5px;
-                    background-color: #ffffff;
-                }
-                QProgressBar::chunk {
-                    background-color: #4a90e2;
-                    border-radius: 3px;
-                }
-                QScrollArea {
-                    background-color: #ffffff;
-                    border: 1px solid #cccccc;
-                }
-                QLabel {
-                    color: #333333;
-                }
-            """)
+        self.setStyleSheet(_DARK_QSS if self.dark_mode else _LIGHT_QSS)
     
     def on_calculation_mode_changed(self):
         """Handle calculation mode change"""
-        mode_map = {0: "default", 1: "swipe", 2: "suspend"}
-        self.current_mode = mode_map.get(self.calc_mode_combo.currentIndex(), "default")
+        self.current_mode = _MODE_BY_INDEX.get(self.calc_mode_combo.currentIndex(), "default")
         self.status_label.setText(f"Mode: {self.calc_mode_combo.currentText()}")
     
     def on_processing_mode_changed(self, mode):
@@ -1077,7 +1510,7 @@ class FinalKindleLogAnalyzer(QMainWindow):
             return
         
         iteration_header = f"\nITERATION_{self.current_iteration:02d}\n"
-        self.all_iterations_data += iteration_header + log_content + "\n"
+        self.all_iterations_chunks += (iteration_header, log_content, "\n")
         
         self.current_iteration += 1
         self.log_input.clear()
@@ -1087,7 +1520,7 @@ class FinalKindleLogAnalyzer(QMainWindow):
     
     def process_all_iterations(self):
         """Process all iterations"""
-        if not self.all_iterations_data:
+        if not self.all_iterations_chunks:
             QMessageBox.warning(self, "Warning", "No iterations to process")
             return
         
@@ -1095,7 +1528,7 @@ class FinalKindleLogAnalyzer(QMainWindow):
         self.status_label.setText("Processing iterations...")
         
         # Create and start log processor thread
-        self.log_processor = LogProcessor(self.all_iterations_data, self.current_mode)
+        self.log_processor = LogProcessor("".join(self.all_iterations_chunks), self.current_mode)
         self.log_processor.progress_updated.connect(self.progress_bar.setValue)
         self.log_processor.result_ready.connect(self.on_processing_complete)
         self.log_processor.error_occurred.connect(self.on_processing_error)
@@ -1116,21 +1549,28 @@ class FinalKindleLogAnalyzer(QMainWindow):
         self.status_label.setText("Processing failed")
     
     def update_all_displays(self):
-        """Update all result displays"""
+        """Update all result displays
+
+        Only the tab on screen is updated right away. The other result tabs
+        are marked stale and updated by refresh_current_tab when shown.
+        """
         if not self.results:
+            # The result views must not keep showing the previous run's rows
+            self.stale_tabs.clear()
+            self.results_model.set_results(self.results)
+            self.heights_model.set_results(self.results)
+            self.waveform_boxes_model.set_results(self.results)
             return
         
-        # Update summary
-        self.update_summary_display()
-        
-        # Update main results table
-        self.update_results_table()
-        
-        # Update waveform boxes - NEW
-        self.update_waveform_boxes()
-        
-        # Update heights and waveforms table
-        self.update_heights_table()
+        self.stale_tabs = set(self.tab_updaters)
+        self.refresh_current_tab()
+    
+    def refresh_current_tab(self, index=None):
+        """Update the current tab's display if it is stale"""
+        tab = self.tab_widget.currentWidget()
+        if tab in self.stale_tabs:
+            self.stale_tabs.discard(tab)
+            self.tab_updaters[tab]()
     
     def update_summary_display(self):
         """Update summary display"""
@@ -1138,16 +1578,27 @@ class FinalKindleLogAnalyzer(QMainWindow):
             return
 
         total_iterations = len(self.results)
-        durations = [r['duration'] for r in self.results]
-        avg_duration = sum(durations) / total_iterations
-        min_duration = min(durations)
-        max_duration = max(durations)
+        # Sum, bound and format the durations in a single pass
+        total_duration = 0
+        min_duration = max_duration = self.results[0]['duration']
+        duration_cells = []
+        for result in self.results:
+            duration = result['duration']
+            total_duration += duration
+            if duration < min_duration:
+                min_duration = duration
+            elif duration > max_duration:
+                max_duration = duration
+            duration_cells.append(f"<td>{duration:.3f}</td>")
+        avg_duration = total_duration / total_iterations
+        # The test case name is user text, so escape it before it goes into HTML
+        test_case_name = html.escape(self.test_case_input.text() or 'Not specified')
 
         # Create the new format for Quick Copy Summary for Excel
         summary_html = f"""
         <h2>📊 Processing Summary</h2>
         <table border="1" cellpadding="8" cellspacing="0" style="border-collapse: collapse;">
-        <tr><td><b>Test Case:</b></td><td>{self.test_case_input.text() or 'Not specified'}</td></tr>
+        <tr><td><b>Test Case:</b></td><td>{test_case_name}</td></tr>
         <tr><td><b>Processing Mode:</b></td><td>{self.calc_mode_combo.currentText()}</td></tr>
         <tr><td><b>Total Iterations:</b></td><td>{total_iterations}</td></tr>
         <tr><td><b>Average Duration:</b></td><td style="background-color: yellow;">{avg_duration:.3f} seconds</td></tr>
@@ -1162,100 +1613,49 @@ class FinalKindleLogAnalyzer(QMainWindow):
         <td><b>Test case name</b></td>
 """
 
+        # Collect the remaining pieces and join them once at the end
+        parts = [summary_html]
+
         # Add iteration columns
-        for i in range(1, total_iterations + 1):
-            summary_html += f"<td><b>IT_{i:02d}</b></td>"
+        parts.extend(f"<td><b>IT_{i:02d}</b></td>" for i in range(1, total_iterations + 1))
 
         # Add AVG column
-        summary_html += "<td><b>AVG</b></td></tr>"
+        parts.append("<td><b>AVG</b></td></tr>")
 
         # Add duration values
-        test_case_name = self.test_case_input.text() or 'Not specified'
-        summary_html += f"<tr><td><b>{test_case_name}</b></td>"
+        parts.append(f"<tr><td><b>{test_case_name}</b></td>")
 
         # Add duration for each iteration
-        for result in self.results:
-            summary_html += f"<td>{result['duration']:.3f}</td>"
+        parts.extend(duration_cells)
 
         # Add average duration
-        summary_html += f"<td>{avg_duration:.3f}</td></tr>"
+        parts.append(f"<td>{avg_duration:.3f}</td></tr>")
 
-        summary_html += "</table>"
+        parts.append("</table>")
 
-        self.summary_text.setHtml(summary_html)
+        self.summary_text.setHtml("".join(parts))
     
     def update_results_table(self):
         """Update main results table - optimized for copying"""
         if not self.results:
             return
         
-        self.results_table.setRowCount(len(self.results))
-        self.results_table.setColumnCount(8)
-        
-        headers = ['Iteration', 'Duration (seconds)', 'Start Time', 'Stop Time',
-                   'Marker', 'Height', 'Selected Waveform', 'Mode']
-        self.results_table.setHorizontalHeaderLabels(headers)
-        
-        for i, result in enumerate(self.results):
-            self.results_table.setItem(i, 0, QTableWidgetItem(str(result['iteration'])))
-
-            # Duration is already in seconds
-            duration_item = QTableWidgetItem(f"{result['duration']:.3f}")
-            duration_item.setBackground(QBrush(QColor(255, 255, 0, 100)))  # Yellow highlighting
-            self.results_table.setItem(i, 1, duration_item)
-            
-            self.results_table.setItem(i, 2, QTableWidgetItem(str(result['start'])))
-            self.results_table.setItem(i, 3, QTableWidgetItem(str(result['stop'])))
-            self.results_table.setItem(i, 4, QTableWidgetItem(str(result['marker'])))
-            self.results_table.setItem(i, 5, QTableWidgetItem(str(result['max_height'])))
-            
-            # Highlight selected waveform
-            waveform_item = QTableWidgetItem(result['max_height_waveform'])
-            waveform_item.setBackground(QBrush(QColor(255, 255, 0, 100)))  # Yellow highlighting
-            self.results_table.setItem(i, 6, waveform_item)
-            
-            self.results_table.setItem(i, 7, QTableWidgetItem(result['mode']))
-        
+        # Reset and resize with painting off so the table repaints once
+        self.results_table.setUpdatesEnabled(False)
+        self.results_model.set_results(self.results)
         self.results_table.resizeColumnsToContents()
+        self.results_table.setUpdatesEnabled(True)
     
     def update_heights_table(self):
         """Update detailed heights and waveforms table"""
         if not self.results:
             return
         
-        # Count total rows needed
-        total_rows = sum(len(result['all_heights']) for result in self.results)
-        
-        self.heights_table.setRowCount(total_rows)
-        self.heights_table.setColumnCount(6)
-        
-        headers = ['Iteration', 'Marker', 'Height', 'Waveform', 'Selected', 'End Time']
-        self.heights_table.setHorizontalHeaderLabels(headers)
-        
-        row = 0
-        for result in self.results:
-            for height_info in result['all_heights']:
-                self.heights_table.setItem(row, 0, QTableWidgetItem(str(result['iteration'])))
-                self.heights_table.setItem(row, 1, QTableWidgetItem(str(height_info['marker'])))
-                self.heights_table.setItem(row, 2, QTableWidgetItem(str(height_info['height'])))
-                self.heights_table.setItem(row, 3, QTableWidgetItem(height_info['waveform']))
-                
-                # Mark if this is the selected marker for final calculation
-                is_selected = str(height_info['marker']) == str(result['marker'])
-                selected_item = QTableWidgetItem("✓" if is_selected else "")
-                if is_selected:
-                    selected_item.setBackground(QBrush(QColor(255, 255, 0, 150)))  # Yellow highlighting
-                self.heights_table.setItem(row, 4, selected_item)
-                
-                # Show end time if available
-                end_time = ""
-                if 'all_end_times' in result and str(height_info['marker']) in result['all_end_times']:
-                    end_time = str(result['all_end_times'][str(height_info['marker'])]['time'])
-                self.heights_table.setItem(row, 5, QTableWidgetItem(end_time))
-                
-                row += 1
-        
+        # Reset and resize with painting off so the table repaints once
+        self.heights_table.setUpdatesEnabled(False)
+        self.heights_model.set_results(self.results)
         self.heights_table.resizeColumnsToContents()
+        self.heights_table.setUpdatesEnabled(True)
     
     def generate_pdf_report(self):
         """Generate enhanced PDF report with highlighting"""
@@ -1264,7 +1664,11 @@ class FinalKindleLogAnalyzer(QMainWindow):
             QMessageBox.warning(self, "Warning", "No results to generate PDF")
             return
 
-        if not ENHANCED_EXPORTS_AVAILABLE:
+        # Imported here so reportlab is only loaded once a PDF is requested
+        try:
+            from pdf_export import PdfExporter
+        except ImportError as e:
+            print(f"Warning: Enhanced export modules not available: {e}")
             QMessageBox.warning(self, "Warning", "Enhanced PDF export modules not available")
             return
 
@@ -1278,42 +1682,60 @@ class FinalKindleLogAnalyzer(QMainWindow):
             try:
                 # Create PDF exporter and generate report
                 exporter = PdfExporter()
-
-                # Map GUI mode to internal mode
-                mode_map = {"Default (Button Up)": "default",
-                           "Swipe (Button Down)": "swipe",
-                           "Suspend (Power Button - FIXED)": "suspend"}
-                current_mode = mode_map.get(self.calc_mode_combo.currentText(), "default")
-
-                # Determine which data to use
-                if self.results:
-                    # Single entry mode
-                    success, message = exporter.generate_pdf_report(
-                        self.results, filename, current_mode
-                    )
-                else:
-                    # Batch mode - flatten batch results
-                    flattened_results = []
-                    for batch in self.batch_results:
-                        flattened_results.extend(batch['results'])
-                    success, message = exporter.generate_pdf_report(
-                        flattened_results, filename, current_mode
-                    )
-
-                if success:
-                    QMessageBox.information(self, "Success",
-                        f"PDF report generated successfully!\n\n"
-                        f"Features included:\n"
-                        f"• Table of contents with iteration summary\n"
-                        f"• Highlighted start/stop points in logs\n"
-                        f"• Original log content for each iteration\n"
-                        f"• Calculation details and waveform logic\n\n"
-                        f"Saved to: {filename}")
-                else:
-                    QMessageBox.critical(self, "Error", f"Failed to generate PDF: {message}")
-
             except Exception as e:
                 QMessageBox.critical(self, "Error", f"Failed to generate PDF report: {str(e)}")
+                return
+
+            # Map GUI mode to internal mode
+            current_mode = _MODE_BY_TEXT.get(self.calc_mode_combo.currentText(), "default")
+
+            self.pdf_report_filename = filename
+            self.start_report_export(
+                "Generating PDF report...", self.on_pdf_report_finished,
+                exporter.generate_pdf_report, self.report_results(), filename, current_mode
+            )
+
+    def report_results(self):
+        """Results a report covers: the single entry results, else all batch results
+
+        The flattened batch list is built once per batch run and reused by
+        later exports until the batch results change.
+        """
+        if self.results:
+            return self.results
+        if self.flattened_batch_results is None:
+            self.flattened_batch_results = [result for batch in self.batch_results
+                                            for result in batch['results']]
+        return self.flattened_batch_results
+
+    def on_pdf_report_finished(self, success, message):
+        """Report the outcome of a background PDF report export"""
+        self.status_label.setText("Ready")
+        if success:
+            QMessageBox.information(self, "Success",
+                f"PDF report generated successfully!\n\n"
+                f"Features included:\n"
+                f"• Table of contents with iteration summary\n"
+                f"• Highlighted start/stop points in logs\n"
+                f"• Original log content for each iteration\n"
+                f"• Calculation details and waveform logic\n\n"
+                f"Saved to: {self.pdf_report_filename}")
+        else:
+            QMessageBox.critical(self, "Error", f"Failed to generate PDF: {message}")
+
+    def start_report_export(self, status, on_finished, export, *args):
+        """Run export(*args) on a ReportExportThread, calling on_finished(success, message)
+
+        Only one report export runs at a time.
+        """
+        if self.report_export_thread is not None and self.report_export_thread.isRunning():
+            QMessageBox.warning(self, "Warning", "A report is still being exported")
+            return
+
+        self.status_label.setText(status)
+        self.report_export_thread = ReportExportThread(export, *args)
+        self.report_export_thread.export_finished.connect(on_finished)
+        self.report_export_thread.start()
 
     def save_enhanced_txt_report(self):
         """Save enhanced TXT report with original logs for each iteration"""
@@ -1329,185 +1751,19 @@ class FinalKindleLogAnalyzer(QMainWindow):
         )
 
         if filename:
-            try:
-                with open(filename, 'w', encoding='utf-8') as f:
-                    f.write("=" * 100 + "\n")
-                    f.write("KINDLE LOG ANALYZER - ENHANCED REPORT WITH ORIGINAL LOGS\n")
-                    f.write("=" * 100 + "\n\n")
-
-                    # Write test case info
-                    f.write(f"Test Case: {self.test_case_input.text() or 'Not specified'}\n")
-                    f.write(f"Processing Mode: {self.calc_mode_combo.currentText()}\n")
-                    f.write(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-
-                    # Determine which data to use and write appropriate summary
-                    if self.results:
-                        # Single entry mode
-                        f.write(f"Total Iterations: {len(self.results)}\n\n")
-
-                        # Summary statistics for single mode
-                        durations = [r['duration'] for r in self.results]
-                        f.write("SUMMARY STATISTICS:\n")
-                        f.write("-" * 50 + "\n")
-                        f.write(f"Average Duration: {sum(durations)/len(durations)/1000:.3f} seconds\n")
-                        f.write(f"Min Duration: {min(durations)/1000:.3f} seconds\n")
-                        f.write(f"Max Duration: {max(durations)/1000:.3f} seconds\n\n")
-                    else:
-                        # Batch mode
-                        total_files = len(self.batch_results)
-                        total_iterations = sum(len(batch['results']) for batch in self.batch_results)
-                        f.write(f"Total Files Processed: {total_files}\n")
-                        f.write(f"Total Iterations: {total_iterations}\n\n")
-
-                        # Summary statistics for batch mode
-                        all_durations = []
-                        for batch in self.batch_results:
-                            for result in batch['results']:
-                                all_durations.append(result['duration'])
-
-                        if all_durations:
-                            f.write("SUMMARY STATISTICS:\n")
-                            f.write("-" * 50 + "\n")
-                            f.write(f"Average Duration: {sum(all_durations)/1000/len(all_durations):.3f} seconds\n")
-                            f.write(f"Min Duration: {min(all_durations)/1000:.3f} seconds\n")
-                            f.write(f"Max Duration: {max(all_durations)/1000:.3f} seconds\n\n")
-
-                    # Quick copy table
-                    f.write("QUICK COPY TABLE (Copy-friendly for Excel):\n")
-                    f.write("-" * 80 + "\n")
-                    f.write("Iteration\tDuration(sec)\tStart\tStop\tMarker\tHeight\tWaveform\tMode\n")
-                    f.write("-" * 80 + "\n")
-
-                    # Write data based on mode
-                    if self.results:
-                        # Single entry mode
-                        for result in self.results:
-                            f.write(f"{result['iteration']}\t{result['duration']}\t{result['start']}\t"
-                                   f"{result['stop']}\t{result['marker']}\t{result['max_height']}\t"
-                                   f"{result['max_height_waveform']}\t{result['mode']}\n")
-                    else:
-                        # Batch mode
-                        for batch in self.batch_results:
-                            for result in batch['results']:
-                                f.write(f"{batch['filename']}_iter{result['iteration']}\t{result['duration']}\t{result['start']}\t"
-                                       f"{result['stop']}\t{result['marker']}\t{result['max_height']}\t"
-                                       f"{result['max_height_waveform']}\t{result['mode']}\n")
-
-                    f.write("\n" + "=" * 100 + "\n")
-                    f.write("DETAILED ITERATION ANALYSIS WITH ORIGINAL LOGS\n")
-                    f.write("=" * 100 + "\n\n")
-
-                    # Write detailed analysis based on mode
-                    if self.results:
-                        # Single entry mode
-                        for result in self.results:
-                            f.write(f"ITERATION_{result['iteration']:02d}\n")
-                            f.write("=" * 50 + "\n\n")
-
-                            # Original log content
-                            f.write("ORIGINAL LOG DATA:\n")
-                            f.write("-" * 30 + "\n")
-
-                            if 'original_log' in result:
-                                log_lines = result['original_log'].split('\n')
-                                for line in log_lines:
-                                    if line.strip():
-                                        # Mark the start line with highlighting annotation
-                                        if 'start_line' in result and result['start_line'] in line:
-                                            f.write(f">>> START POINT >>> {line}\n")
-                                        else:
-                                            f.write(f"{line}\n")
-                            else:
-                                f.write("Original log data not available\n")
-
-                            f.write("\n")
-                            f.write("CALCULATION RESULTS:\n")
-                            f.write("-" * 30 + "\n")
-                            f.write(f"Start Time: {result['start']}\n")
-                            f.write(f"Stop Time: {result['stop']}\n")
-                            f.write(f"Duration: {result['duration'] / 1000:.3f} seconds [SELECTED]\n")
-                            f.write(f"Selected Marker: {result['marker']}\n")
-                            f.write(f"Selected Height: {result['max_height']}px\n")
-                            f.write(f"Selected Waveform: {result['max_height_waveform']} [HIGHLIGHTED]\n\n")
-
-                            f.write("ALL HEIGHTS & WAVEFORMS:\n")
-                            f.write("-" * 30 + "\n")
-                            for height_info in result['all_heights']:
-                                marker = height_info['marker']
-                                selected = " [SELECTED FOR CALCULATION]" if str(marker) == str(result['marker']) else ""
-                                f.write(f"  Marker {marker}: {height_info['height']}px, {height_info['waveform']}{selected}\n")
-
-                            if 'all_end_times' in result:
-                                f.write("\nEND TIMES BY MARKER:\n")
-                                f.write("-" * 30 + "\n")
-                                for marker, end_info in result['all_end_times'].items():
-                                    selected = " [SELECTED]" if str(marker) == str(result['marker']) else ""
-                                    f.write(f"  Marker {marker}: {end_info['time']}{selected}\n")
-
-                            f.write("\n" + "=" * 50 + "\n\n")
-                    else:
-                        # Batch mode
-                        for batch in self.batch_results:
-                            f.write(f"FILE: {batch['filename']}\n")
-                            f.write("=" * 60 + "\n\n")
-
-                            if batch['results']:
-                                for result in batch['results']:
-                                    f.write(f"  ITERATION_{result['iteration']:02d}\n")
-                                    f.write("  " + "-" * 40 + "\n\n")
-
-                                    # Original log content
-                                    f.write("  ORIGINAL LOG DATA:\n")
-                                    f.write("  " + "-" * 20 + "\n")
-
-                                    if 'original_log' in result:
-                                        log_lines = result['original_log'].split('\n')
-                                        for line in log_lines:
-                                            if line.strip():
-                                                # Mark the start line with highlighting annotation
-                                                if 'start_line' in result and result['start_line'] in line:
-                                                    f.write(f"  >>> START POINT >>> {line}\n")
-                                                else:
-                                                    f.write(f"  {line}\n")
-                                    else:
-                                        f.write("  Original log data not available\n")
-
-                                    f.write("\n")
-                                    f.write("  CALCULATION RESULTS:\n")
-                                    f.write("  " + "-" * 20 + "\n")
-                                    f.write(f"  Start Time: {result['start']}\n")
-                                    f.write(f"  Stop Time: {result['stop']}\n")
-                                    f.write(f"  Duration: {result['duration'] / 1000:.3f} seconds [SELECTED]\n")
-                                    f.write(f"  Selected Marker: {result['marker']}\n")
-                                    f.write(f"  Selected Height: {result['max_height']}px\n")
-                                    f.write(f"  Selected Waveform: {result['max_height_waveform']} [HIGHLIGHTED]\n\n")
-
-                                    f.write("  ALL HEIGHTS & WAVEFORMS:\n")
-                                    f.write("  " + "-" * 20 + "\n")
-                                    for height_info in result['all_heights']:
-                                        marker = height_info['marker']
-                                        selected = " [SELECTED FOR CALCULATION]" if str(marker) == str(result['marker']) else ""
-                                        f.write(f"    Marker {marker}: {height_info['height']}px, {height_info['waveform']}{selected}\n")
-
-                                    if 'all_end_times' in result:
-                                        f.write("\n  END TIMES BY MARKER:\n")
-                                        f.write("  " + "-" * 20 + "\n")
-                                        for marker, end_info in result['all_end_times'].items():
-                                            selected = " [SELECTED]" if str(marker) == str(result['marker']) else ""
-                                            f.write(f"    Marker {marker}: {end_info['time']}{selected}\n")
-
-                                    f.write("\n  " + "=" * 40 + "\n\n")
-                            else:
-                                f.write("  No valid results found in this file.\n\n")
-
-                    f.write("=" * 100 + "\n")
-                    f.write("END OF ENHANCED REPORT\n")
-                    f.write("=" * 100 + "\n")
-
-                QMessageBox.information(self, "Success", f"Enhanced TXT report with original logs saved to:\n{filename}")
-
-            except Exception as e:
-                QMessageBox.critical(self, "Error", f"Failed to save enhanced TXT report: {str(e)}")
+            self.start_report_export(
+                "Saving enhanced TXT report...", self.on_txt_report_finished,
+                write_enhanced_txt_report, filename, self.results, self.batch_results,
+                self.test_case_input.text(), self.calc_mode_combo.currentText()
+            )
+    
+    def on_txt_report_finished(self, success, message):
+        """Report the outcome of a background TXT report export"""
+        self.status_label.setText("Ready")
+        if success:
+            QMessageBox.information(self, "Success", message)
+        else:
+            QMessageBox.critical(self, "Error", message)
     
     def export_excel_with_highlighting(self):
         """Export to Excel with yellow highlighting"""
@@ -1524,172 +1780,99 @@ class FinalKindleLogAnalyzer(QMainWindow):
 
         if filename:
             try:
-                workbook = openpyxl.Workbook()
-
+                # Write-only workbook: rows are streamed out on save instead
+                # of keeping a styled cell object for every value
+                workbook = openpyxl.Workbook(write_only=True)
+                
+                # Styles are created once and shared by every cell using them
+                header_font = Font(bold=True, color="FFFFFF")
+                header_fill = PatternFill(start_color="4A90E2", end_color="4A90E2", fill_type="solid")
+                # Data with highlighting
+                yellow_fill = PatternFill(start_color="FFFF00", end_color="FFFF00", fill_type="solid")
+                
                 # Main Results Sheet
-                sheet = workbook.active
-                sheet.title = "Main Results"
-
-                # Headers
                 headers = ['Iteration', 'Duration (seconds)', 'Start Time', 'Stop Time',
                           'Marker', 'Height', 'Selected Waveform', 'Mode']
-                for col, header in enumerate(headers, 1):
-                    cell = sheet.cell(row=1, column=col, value=header)
-                    cell.font = Font(bold=True, color="FFFFFF")
-                    cell.fill = PatternFill(start_color="4A90E2", end_color="4A90E2", fill_type="solid")
-
-                # Data with highlighting
-                yellow_fill = PatternFill(start_color="FFFF00", end_color="FFFF00", fill_type="solid")
-
-                # Write data based on mode
-                row = 2
-                if self.results:
-                    # Single entry mode
-                    for result in self.results:
-                        sheet.cell(row=row, column=1, value=result['iteration'])
-
-                        # Highlight duration
-                        duration_cell = sheet.cell(row=row, column=2, value=result['duration'])
-                        duration_cell.fill = yellow_fill
-
-                        sheet.cell(row=row, column=3, value=result['start'])
-                        sheet.cell(row=row, column=4, value=result['stop'])
-                        sheet.cell(row=row, column=5, value=result['marker'])
-                        sheet.cell(row=row, column=6, value=result['max_height'])
-
-                        # Highlight selected waveform
-                        waveform_cell = sheet.cell(row=row, column=7, value=result['max_height_waveform'])
-                        waveform_cell.fill = yellow_fill
-
-                        sheet.cell(row=row, column=8, value=result['mode'])
-                        row += 1
-                else:
-                    # Batch mode
-                    for batch in self.batch_results:
-                        for result in batch['results']:
-                            sheet.cell(row=row, column=1, value=f"{batch['filename']}_iter{result['iteration']}")
-
-                            # Highlight duration
-                            duration_cell = sheet.cell(row=row, column=2, value=result['duration'])
-                            duration_cell.fill = yellow_fill
-
-                            sheet.cell(row=row, column=3, value=result['start'])
-                            sheet.cell(row=row, column=4, value=result['stop'])
-                            sheet.cell(row=row, column=5, value=result['marker'])
-                            sheet.cell(row=row, column=6, value=result['max_height'])
-
-                            # Highlight selected waveform
-                            waveform_cell = sheet.cell(row=row, column=7, value=result['max_height_waveform'])
-                            waveform_cell.fill = yellow_fill
-
-                            sheet.cell(row=row, column=8, value=result['mode'])
-                            row += 1
-
-                # Auto-size columns
-                for column in sheet.columns:
-                    max_length = 0
-                    column_letter = column[0].column_letter
-                    for cell in column:
-                        try:
-                            if cell.value:
-                                length = len(str(cell.value))
-                                if length > max_length:
-                                    max_length = length
-                        except:
-                            pass
-                    adjusted_width = min(max_length + 2, 50)
-                    sheet.column_dimensions[column_letter].width = adjusted_width
-
+                self.write_excel_sheet(workbook.create_sheet(title="Main Results"), headers,
+                                       self.excel_result_rows(), header_font, header_fill, yellow_fill)
+                
                 # Detailed Heights Sheet
-                detail_sheet = workbook.create_sheet(title="Heights & Waveforms")
-
                 detail_headers = ['Iteration', 'Marker', 'Height', 'Waveform', 'Selected', 'End Time']
-                for col, header in enumerate(detail_headers, 1):
-                    cell = detail_sheet.cell(row=1, column=col, value=header)
-                    cell.font = Font(bold=True, color="FFFFFF")
-                    cell.fill = PatternFill(start_color="4A90E2", end_color="4A90E2", fill_type="solid")
-
-                detail_row = 2
-                # Write detailed data based on mode
-                if self.results:
-                    # Single entry mode
-                    for result in self.results:
-                        for height_info in result['all_heights']:
-                            detail_sheet.cell(row=detail_row, column=1, value=result['iteration'])
-                            detail_sheet.cell(row=detail_row, column=2, value=height_info['marker'])
-                            detail_sheet.cell(row=detail_row, column=3, value=height_info['height'])
-                            detail_sheet.cell(row=detail_row, column=4, value=height_info['waveform'])
-
-                            # Highlight selected rows
-                            is_selected = str(height_info['marker']) == str(result['marker'])
-                            selected_cell = detail_sheet.cell(row=detail_row, column=5, value="✓" if is_selected else "")
-                            if is_selected:
-                                selected_cell.fill = yellow_fill
-                                # Highlight entire row for selected marker
-                                for col in range(1, 7):
-                                    detail_sheet.cell(row=detail_row, column=col).fill = yellow_fill
-
-                            # End time
-                            end_time = ""
-                            if 'all_end_times' in result and str(height_info['marker']) in result['all_end_times']:
-                                end_time = result['all_end_times'][str(height_info['marker'])]['time']
-                            detail_sheet.cell(row=detail_row, column=6, value=end_time)
-
-                            detail_row += 1
-                else:
-                    # Batch mode
-                    for batch in self.batch_results:
-                        for result in batch['results']:
-                            for height_info in result['all_heights']:
-                                detail_sheet.cell(row=detail_row, column=1, value=f"{batch['filename']}_iter{result['iteration']}")
-                                detail_sheet.cell(row=detail_row, column=2, value=height_info['marker'])
-                                detail_sheet.cell(row=detail_row, column=3, value=height_info['height'])
-                                detail_sheet.cell(row=detail_row, column=4, value=height_info['waveform'])
-
-                                # Highlight selected rows
-                                is_selected = str(height_info['marker']) == str(result['marker'])
-                                selected_cell = detail_sheet.cell(row=detail_row, column=5, value="✓" if is_selected else "")
-                                if is_selected:
-                                    selected_cell.fill = yellow_fill
-                                    # Highlight entire row for selected marker
-                                    for col in range(1, 7):
-                                        detail_sheet.cell(row=detail_row, column=col).fill = yellow_fill
-
-                                # End time
-                                end_time = ""
-                                if 'all_end_times' in result and str(height_info['marker']) in result['all_end_times']:
-                                    end_time = result['all_end_times'][str(height_info['marker'])]['time']
-                                detail_sheet.cell(row=detail_row, column=6, value=end_time)
-
-                                detail_row += 1
-
-                # Auto-size columns for detail sheet
-                for column in detail_sheet.columns:
-                    max_length = 0
-                    column_letter = column[0].column_letter
-                    for cell in column:
-                        try:
-                            if cell.value:
-                                length = len(str(cell.value))
-                                if length > max_length:
-                                    max_length = length
-                        except:
-                            pass
-                    adjusted_width = min(max_length + 2, 50)
-                    detail_sheet.column_dimensions[column_letter].width = adjusted_width
-
-                workbook.save(filename)
-                QMessageBox.information(self, "Success", f"Excel file with highlighting saved to:\n{filename}")
+                self.write_excel_sheet(workbook.create_sheet(title="Heights & Waveforms"), detail_headers,
+                                       self.excel_height_rows(), header_font, header_fill, yellow_fill)
 
-            except Exception as e:
-                QMessageBox.critical(self, "Error", f"Failed to save Excel file: {str(e)}")
-                    
                 workbook.save(filename)
                 QMessageBox.information(self, "Success", f"Excel file with highlighting saved to:\n{filename}")
 
             except Exception as e:
                 QMessageBox.critical(self, "Error", f"Failed to save Excel file: {str(e)}")
     
+    def excel_labelled_results(self):
+        """Yield (iteration label, result) for the Excel export"""
+        if self.results:
+            # Single entry mode
+            for result in self.results:
+                yield result['iteration'], result
+        else:
+            # Batch mode
+            for batch in self.batch_results:
+                for result in batch['results']:
+                    yield f"{batch['filename']}_iter{result['iteration']}", result
+    
+    def excel_result_rows(self):
+        """Yield (values, highlighted columns) for the Main Results sheet"""
+        # Duration and selected waveform are highlighted
+        highlighted = (1, 6)
+        for label, result in self.excel_labelled_results():
+            yield [label, result['duration'], result['start'], result['stop'], result['marker'],
+                   result['max_height'], result['max_height_waveform'], result['mode']], highlighted
+    
+    def excel_height_rows(self):
+        """Yield (values, highlighted columns) for the Heights & Waveforms sheet"""
+        for label, result in self.excel_labelled_results():
+            selected_marker = result['marker']
+            end_times = result.get('all_end_times', {})
+            for height_info in result['all_heights']:
+                # Highlight entire row for selected marker
+                is_selected = height_info.marker == selected_marker
+                
+                # End time
+                end_info = end_times.get(height_info.marker)
+                end_time = end_info['time'] if end_info is not None else ""
+                
+                yield ([label, height_info.marker, height_info.height, height_info.waveform,
+                        "✓" if is_selected else "", end_time],
+                       range(6) if is_selected else ())
+    
+    def write_excel_sheet(self, sheet, headers, rows, header_font, header_fill, highlight_fill):
+        """Write a header row and (values, highlighted columns) rows to a write-only sheet"""
+        rows = list(rows)
+        
+        # Auto-size columns. A write-only sheet needs the widths before the
+        # first row is written.
+        widths = [len(header) for header in headers]
+        for values, _ in rows:
+            for col, value in enumerate(values):
+                if value:
+                    widths[col] = max(widths[col], len(str(value)))
+        for col, width in enumerate(widths, 1):
+            sheet.column_dimensions[get_column_letter(col)].width = min(width + 2, 50)
+        
+        header_cells = []
+        for header in headers:
+            cell = WriteOnlyCell(sheet, value=header)
+            cell.font = header_font
+            cell.fill = header_fill
+            header_cells.append(cell)
+        sheet.append(header_cells)
+        
+        for values, highlighted in rows:
+            for col in highlighted:
+                cell = WriteOnlyCell(sheet, value=values[col])
+                cell.fill = highlight_fill
+                values[col] = cell
+            sheet.append(values)
+    
     def select_batch_files(self):
         """Select files for batch processing"""
         files, _ = QFileDialog.getOpenFileNames(
@@ -1716,77 +1899,57 @@ class FinalKindleLogAnalyzer(QMainWindow):
 
         self.status_label.setText("Processing batch files...")
         self.batch_results = []
+        self.flattened_batch_results = None
+        self.process_batch_btn.setEnabled(False)
 
-        for file_path in self.loaded_files:
-            try:
-                with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                    content = f.read()
-
-                # Process content using log processor
-                processor = LogProcessor(content, self.current_mode)
-                # Simulate processing for batch
-                iterations = re.split(r'ITERATION_(\d+)', content)[1:]
-                if not iterations:
-                    iterations = ["01", content]
-
-                iteration_pairs = []
-                for i in range(0, len(iterations), 2):
-                    if i+1 < len(iterations):
-                        iteration_num = iterations[i]
-                        iteration_content = iterations[i+1]
-                        iteration_pairs.append((iteration_num, iteration_content))
-
-                file_results = []
-
-                for iteration_num, iteration_content in iteration_pairs:
-                    lines = iteration_content.split('\n')
-                    result = processor.process_iteration(lines, iteration_num, self.current_mode)
-                    if result:
-                        result['original_log'] = iteration_content.strip()
-                        file_results.append(result)
-
-                self.batch_results.append({
-                    'filename': os.path.basename(file_path),
-                    'results': file_results
-                })
+        self.discard_batch_processor()
+        self.batch_processor = BatchProcessor(self.loaded_files, self.current_mode, self)
+        self.batch_processor.file_failed.connect(self.on_batch_file_failed)
+        self.batch_processor.batch_ready.connect(self.on_batch_complete)
+        self.batch_processor.start()
 
-            except Exception as e:
-                QMessageBox.warning(self, "Warning", f"Error processing {file_path}: {str(e)}")
+    def discard_batch_processor(self):
+        """Forget the current batch so signals it still sends are ignored"""
+        processor = self.batch_processor
+        if processor is None:
+            return
+        self.batch_processor = None
+        # The window owns the thread, so a running batch is kept alive
+        # until it finishes instead of being destroyed mid-run
+        if processor.isRunning():
+            processor.finished.connect(processor.deleteLater)
+        else:
+            processor.deleteLater()
+
+    def on_batch_file_failed(self, file_path, error):
+        """Report a batch file that could not be processed"""
+        if self.sender() is not self.batch_processor:
+            return
+        QMessageBox.warning(self, "Warning", f"Error processing {file_path}: {error}")
+
+    def on_batch_complete(self, batch_results):
+        """Handle batch processing completion"""
+        # Results of a batch that was cleared or replaced meanwhile are dropped
+        if self.sender() is not self.batch_processor:
+            return
+        self.batch_results = batch_results
+        self.flattened_batch_results = None
+        self.process_batch_btn.setEnabled(bool(self.loaded_files))
 
         self.update_batch_display()
         if self.batch_results:
             self.enable_export_buttons()
-        self.status_label.setText(f"Processed {len(self.loaded_files)} files")
+        self.status_label.setText(f"Processed {len(self.batch_processor.file_paths)} files")
 
     def update_batch_display(self):
         """Update batch results display"""
         if not self.batch_results:
             return
         
-        batch_html = "<h2>📁 Batch Processing Results</h2>"
-        
-        for batch in self.batch_results:
-            batch_html += f"<h3>📄 {batch['filename']}</h3>"
-            if batch['results']:
-                batch_html += "<table border='1' cellpadding='5' cellspacing='0'>"
-                batch_html += "<tr><th>Iteration</th><th>Duration</th><th>Start</th><th>Stop</th><th>Height</th><th>Waveform</th></tr>"
-                
-                for result in batch['results']:
-                    batch_html += f"""
-                    <tr>
-                    <td>{result['iteration']}</td>
-                    <td style='background-color: yellow;'>{result['duration']}</td>
-                    <td>{result['start']}</td>
-                    <td>{result['stop']}</td>
-                    <td>{result['max_height']}</td>
-                    <td style='background-color: yellow;'>{result['max_height_waveform']}</td>
-                    </tr>
-                    """
-                batch_html += "</table><br>"
-            else:
-                batch_html += "<p>No valid results found.</p>"
-        
-        self.batch_results_text.setHtml(batch_html)
+        self.batch_results_table.setUpdatesEnabled(False)
+        self.batch_results_model.set_batch_results(self.batch_results)
+        self.batch_results_table.resizeColumnsToContents()
+        self.batch_results_table.setUpdatesEnabled(True)
     
     def enable_export_buttons(self):
         """Enable export buttons"""
@@ -1798,20 +1961,21 @@ class FinalKindleLogAnalyzer(QMainWindow):
         """Clear all data"""
         self.results = []
         self.batch_results = []
+        self.flattened_batch_results = None
         self.loaded_files = []
-        self.all_iterations_data = ""
+        self.all_iterations_chunks = []
         self.current_iteration = 1
+        self.discard_batch_processor()
         
         self.log_input.clear()
         self.files_list.clear()
+        self.stale_tabs.clear()
         self.summary_text.clear()
-        self.results_table.setRowCount(0)
-        self.heights_table.setRowCount(0)
-        self.batch_results_text.clear()
+        self.results_model.set_results(self.results)
+        self.heights_model.set_results(self.results)
+        self.batch_results_model.set_batch_results(self.batch_results)
         
-        # Clear waveform boxes
-        for i in reversed(range(self.waveform_grid.count())): 
-            self.waveform_grid.itemAt(i).widget().setParent(None)
+        self.waveform_boxes_model.set_results(self.results)
         
         self.save_pdf_btn.setEnabled(False)
         self.save_txt_btn.setEnabled(False)
@@ -1823,6 +1987,8 @@ class FinalKindleLogAnalyzer(QMainWindow):
 
 # Fixed main execution block - only one instance at the end
 if __name__ == '__main__':
+    # Needed for the LogProcessor worker processes in frozen Windows builds
+    multiprocessing.freeze_support()
     app = QApplication(sys.argv)
     
     # Set application-wide font - use a cross-platform font
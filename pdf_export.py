@@ -275,8 +275,9 @@ class PdfExporter:
             # Split log into lines and process each
             log_lines = original_log.split('\n')
             for line in log_lines:
-                if line.strip():
-                    highlighted_line = self.highlight_log_line(line.strip(), mode=mode)
+                line = line.strip()  # Strip once; blank lines are skipped
+                if line:
+                    highlighted_line = self.highlight_log_line(line, mode=mode)
                     # Escape HTML characters for ReportLab
                     safe_line = highlighted_line.replace('<', '&lt;').replace('>', '&gt;')
                     # But keep our highlighting tags
@@ -319,12 +320,8 @@ class PdfExporter:
             story.append(Paragraph("All Heights Found:", self.styles['Heading4']))
             
             height_data = [['Marker', 'Height', 'Waveform']]
-            for height_info in all_heights:
-                height_data.append([
-                    height_info.get('marker', 'N/A'),
-                    str(height_info.get('height', 'N/A')),
-                    height_info.get('waveform', 'N/A')
-                ])
+            for marker, height, waveform in all_heights:
+                height_data.append([str(marker), str(height), waveform])
             
             if len(height_data) > 1:  # More than just header
                 height_table = Table(height_data, colWidths=[1*inch, 1*inch, 2*inch])
@@ -354,12 +351,12 @@ def test_pdf_export():
             'start': 650205,
             'stop': 651234,
             'duration': 1029,
-            'marker': '123',
+            'marker': 123,
             'max_height': 1200,
             'max_height_waveform': 'DU',
             'all_heights': [
-                {'marker': '123', 'height': 1200, 'waveform': 'DU'},
-                {'marker': '124', 'height': 800, 'waveform': 'unknown'}
+                (123, 1200, 'DU'),
+                (124, 800, 'unknown')
             ],
             'original_log': '''1751099650.205215 def:pbpress:time=650.205:Power button pressed
 1751099651.234567 update end marker=123 end time=1751099651234567'''
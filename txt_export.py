@@ -155,7 +155,7 @@ def test_txt_export():
             'start': 650205,
             'stop': 651234,
             'duration': 1029,
-            'marker': '123',
+            'marker': 123,
             'max_height': 1200,
             'max_height_waveform': 'DU',
             'original_log': '''1751099650.205215 def:pbpress:time=650.205:Power button pressed
@@ -167,7 +167,7 @@ def test_txt_export():
             'start': 652345,
             'stop': 653456,
             'duration': 1111,
-            'marker': '124',
+            'marker': 124,
             'max_height': 800,
             'max_height_waveform': 'GC16',
             'original_log': '''1751099652.345678 def:pbpress:time=652.345:Power button pressed
@@ -109,9 +109,7 @@ class WaveformVisualizer:
             return
         
         # Prepare data for plotting
-        markers = [h.get('marker', f'M{i}') for i, h in enumerate(all_heights)]
-        heights = [h.get('height', 0) for h in all_heights]
-        waveforms = [h.get('waveform', 'unknown') for h in all_heights]
+        markers, heights, waveforms = (list(column) for column in zip(*all_heights))
         
         # Create bar chart
         x_pos = np.arange(len(markers))
@@ -200,10 +198,7 @@ class WaveformVisualizer:
                     all_heights = result.get('all_heights', [])
                     if all_heights:
                         f.write("\nAll Heights:\n")
-                        for height_info in all_heights:
-                            marker = height_info.get('marker', 'N/A')
-                            height = height_info.get('height', 'N/A')
-                            waveform = height_info.get('waveform', 'N/A')
+                        for marker, height, waveform in all_heights:
                             f.write(f"  Marker {marker}: {height} ({waveform})\n")
                     
                     f.write("\n" + "=" * 60 + "\n\n")
@@ -223,13 +218,13 @@ def test_waveform_visualization():
             'start': 650205,
             'stop': 651234,
             'duration': 1029,
-            'marker': '123',
+            'marker': 123,
             'max_height': 1200,
             'max_height_waveform': 'DU',
             'all_heights': [
-                {'marker': '123', 'height': 1200, 'waveform': 'DU'},
-                {'marker': '124', 'height': 800, 'waveform': 'GC16'},
-                {'marker': '125', 'height': 600, 'waveform': 'unknown'}
+                (123, 1200, 'DU'),
+                (124, 800, 'GC16'),
+                (125, 600, 'unknown')
             ]
         },
         {
@@ -237,12 +232,12 @@ def test_waveform_visualization():
             'start': 652345,
             'stop': 653456,
             'duration': 1111,
-            'marker': '126',
+            'marker': 126,
             'max_height': 1000,
             'max_height_waveform': 'GC16',
             'all_heights': [
-                {'marker': '126', 'height': 1000, 'waveform': 'GC16'},
-                {'marker': '127', 'height': 750, 'waveform': 'DU'}
+                (126, 1000, 'GC16'),
+                (127, 750, 'DU')
             ]
         },
         {
@@ -250,13 +245,13 @@ def test_waveform_visualization():
             'start': 654567,
             'stop': 655678,
             'duration': 1111,
-            'marker': '128',
+            'marker': 128,
             'max_height': 1400,
             'max_height_waveform': 'GLR16',
             'all_heights': [
-                {'marker': '128', 'height': 1400, 'waveform': 'GLR16'},
-                {'marker': '129', 'height': 900, 'waveform': 'DU'},
-                {'marker': '130', 'height': 700, 'waveform': 'GC16'}
+                (128, 1400, 'GLR16'),
+                (129, 900, 'DU'),
+                (130, 700, 'GC16')
             ]
         }
     ]